@@ -0,0 +1,158 @@
+"""
+_common.py
+
+Helpers shared by the cleaner scripts.
+"""
+
+import codecs
+import re
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+EUR_TO_USD_RATE = 1.08
+USD_TO_EUR_RATE = 1.0 / EUR_TO_USD_RATE
+
+PRICE_JUNK_RE = re.compile(r"[^\d.,\-]")
+DISCOUNT_RE = re.compile(r"(-?\d+)")
+
+# Prices carry at most cents, so float32 is plenty; discounts are whole percents.
+PRICE_COLUMNS = ["price_eur", "price_usd", "original_price_eur", "original_price_usd", "price"]
+
+def parse_price_usd_vec(s):
+    """
+    Convert a column of price strings like '$39.99' or 'Free' to float USD.
+    'Free' anywhere -> 0.0; '1,299.99' and '12,99' are both understood.
+    """
+    s = s.astype("string").str.strip()
+    free_mask = s.str.lower().str.contains("free", regex=False).fillna(False)
+
+    cleaned = s.str.replace(PRICE_JUNK_RE, "", regex=True)
+    n_dots = cleaned.str.count(r"\.")
+    n_commas = cleaned.str.count(",")
+    thousands_mask = (n_dots.eq(1) & n_commas.ge(1)).fillna(False)
+    decimal_comma_mask = (n_commas.eq(1) & n_dots.eq(0)).fillna(False)
+    cleaned = cleaned.mask(
+        thousands_mask, cleaned.str.replace(",", "", regex=False)
+    ).mask(decimal_comma_mask, cleaned.str.replace(",", ".", regex=False))
+
+    out = pd.to_numeric(cleaned, errors="coerce").astype("float64")
+    return out.mask(free_mask, 0.0)
+
+def parse_discount_vec(s):
+    """Convert a column like '-15%' / '15%' to positive floats; missing -> 0.0."""
+    nums = s.astype("string").str.extract(DISCOUNT_RE, expand=False)
+    return pd.to_numeric(nums, errors="coerce").abs().astype("float64").fillna(0.0)
+
+def compute_original_price_vec(price, discount_pct):
+    """
+    Estimate original prices from current prices and discount percentages.
+    Rows without a discount keep their price; NaN prices stay NaN.
+    """
+    p = price.to_numpy(dtype="float64")
+    pct = np.asarray(discount_pct, dtype="float64")
+    denom = 1.0 - pct / 100.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        discounted = np.round(p / denom, 2)
+    # A 100% discount has no recoverable original price, so keep the current one.
+    return pd.Series(
+        np.where((pct > 0) & (denom != 0), discounted, p), index=price.index
+    )
+
+def clean_storefront(df, *, price_col, platform, storefront, is_preorder, discount_col=None):
+    """
+    Build the shared USD/EUR price columns plus platform/storefront constants
+    for a single-storefront scrape (Steam, Xbox) in one assign chain.
+    """
+    return (
+        df.assign(
+            price_usd=parse_price_usd_vec(df[price_col]),
+            discount_pct=(
+                parse_discount_vec(df[discount_col]) if discount_col else 0.0
+            ),
+            platform=platform,
+            storefront=storefront,
+            is_preorder=is_preorder,
+        )
+        .assign(price_eur=lambda d: (d["price_usd"] * USD_TO_EUR_RATE).round(2))
+        .assign(
+            original_price_eur=lambda d: compute_original_price_vec(
+                d["price_eur"], d["discount_pct"]
+            )
+        )
+    )
+
+def drop_seen(df, key, seen):
+    """Drop rows whose key was already kept, in this chunk or an earlier one."""
+    # Categorical codes make duplicated/isin hash small ints instead of strings.
+    keys = df[key].astype("category")
+    keep = ~keys.duplicated() & ~keys.isin(seen)
+    seen.update(keys[keep].tolist())
+    return df[keep].copy()
+
+def downcast_prices(df):
+    """Store price columns as float32 and discount_pct as int16 before writing."""
+    out = {c: df[c].astype("float32") for c in PRICE_COLUMNS if c in df.columns}
+    if "discount_pct" in df.columns:
+        out["discount_pct"] = df["discount_pct"].round().astype("int16")
+    return df.assign(**out)
+
+def write_csv_chunk(df, fp, header):
+    """
+    Append a cleaned frame to an open binary CSV file. This stays on to_csv:
+    Arrow's CSV writer quotes every string and writes 0.0 as 0 and booleans as
+    true/false, which would change the files the notebooks read.
+    """
+    df.to_csv(fp, header=header, index=False, encoding="utf-8")
+
+def output_path(base_path, fmt="csv"):
+    """Return the cleaned output path for the given format ('csv' or 'parquet')."""
+    return base_path.with_suffix(f".{fmt}")
+
+@contextmanager
+def output_writer(base_path, fmt="csv", bom=True):
+    """
+    Yield a write(df) callable that appends cleaned chunks to the output file.
+    CSV stays the default, UTF-8 with a BOM unless bom=False (like to_csv's
+    'utf-8-sig'); 'parquet' writes one zstd-compressed Parquet file.
+    """
+    path = output_path(base_path, fmt)
+
+    if fmt == "csv":
+        with open(path, "wb") as fp:
+            if bom:
+                fp.write(codecs.BOM_UTF8)
+            header = True
+
+            def write(df):
+                nonlocal header
+                write_csv_chunk(df, fp, header=header)
+                header = False
+
+            yield write
+        return
+
+    if fmt != "parquet":
+        raise ValueError(f"Unknown output format: {fmt}")
+
+    writer = None
+    try:
+        def write(df):
+            nonlocal writer
+            if writer is None:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                writer = pq.ParquetWriter(path, table.schema, compression="zstd")
+            else:
+                # Later chunks follow the first chunk's schema.
+                table = pa.Table.from_pandas(
+                    df, schema=writer.schema, preserve_index=False
+                )
+            writer.write_table(table)
+
+        yield write
+    finally:
+        if writer is not None:
+            writer.close()
@@ -1,176 +1,155 @@
-import math
+import re
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
+from _common import downcast_prices, output_path, output_writer
+
 RAW_PATH = Path("data/raw/epicgames.csv")
 CLEAN_PATH = Path("data/cleaned/cleaned_epicgames.csv")
 
-INR_TO_USD = 0.012  
+INR_TO_USD = 0.012
 
-def parse_price(x):
-    """
-    Take a price string like '₹3,249' and return (3249.0, '₹').
-    Handle 'Free' as 0.0.
-    If missing, returns (nan, None).
-    """
-    if pd.isna(x):
-        return (math.nan, None)
+CHUNK_SIZE = 200_000
 
-    s = str(x).strip()
-    if not s:
-        return (math.nan, None)
+RAW_COLUMNS = ["name", "platform", "price of game", "date release"]
 
-    if s.lower().startswith("free"):
-        return (0.0, None)
-
-    currency_chars = "".join(
-        ch for ch in s if not ch.isdigit() and ch not in {",", ".", " "}
-    )
-    currency = currency_chars or None
-
-    number = "".join(ch for ch in s if ch.isdigit() or ch == ".")
-    value = float(number) if number else math.nan
-    return value, currency
-
-def parse_percent(x):
-    """
-    Take a percent string like '92%' and return 92.0.
-    If missing, returns nan.
-    """
-    if pd.isna(x):
-        return math.nan
+# The currency may lead ('₹3,249') or trail ('3,249 INR').
+PRICE_RE = re.compile(
+    r"^(?P<currency>[^\d\s.,]*)\s*(?P<number>[\d.,]+)\s*(?P<suffix>[^\d\s.,]+)?"
+)
 
-    s = str(x).strip().replace("%", "")
-    return float(s) if s else math.nan
+# Checked in order, so the first matching label wins.
+PLATFORM_PATTERNS = [
+    ("PC", re.compile(r"windows|win|pc")),
+    ("Xbox", re.compile(r"xbox")),
+    ("PlayStation", re.compile(r"playstation|ps[1-5]|ps vita")),
+    ("Nintendo Switch", re.compile(r"switch|nintendo")),
+    ("Mac", re.compile(r"mac")),
+    ("Linux", re.compile(r"linux|steamos")),
+    ("Android", re.compile(r"android")),
+    ("iOS", re.compile(r"ios|iphone|ipad")),
+]
 
-def convert_to_usd(value, currency):
+def normalize_platform_column(platform: pd.Series) -> pd.Series:
     """
-    Convert numeric price + currency to USD.
-    For this dataset, prices are in INR (₹), so we map to USD.
-    If currency is unknown/None, we leave as-is.
+    Map platform strings like 'Windows, MacOS, Linux' to unique normalized
+    labels (PC, PlayStation, Xbox, Nintendo Switch, Mac, Linux, Android, iOS,
+    Other) joined with ' / ' in first-seen order. Empty cells become 'Other'.
     """
-    if pd.isna(value):
-        return math.nan
-
-    if not currency:
-
-        return value
-
-    if currency == "₹" or str(currency).upper() == "INR":
-        return value * INR_TO_USD
-
-    return value
+    parts = (
+        platform.astype("string")
+        .str.replace("/", ",", regex=False)
+        .str.split(",")
+        .explode()
+        .str.strip()
+        .str.lower()
+    )
+    parts = parts[parts.notna() & (parts != "") & ~parts.isin(["nan", "none"])]
 
-def map_single_platform(raw: str) -> str | None:
-    """
-    Map a raw platform string to a normalized category:
-    PC, PlayStation, Xbox, Nintendo Switch, Mac, Linux, Android, iOS, Other
-    """
-    if raw is None:
-        return None
-
-    s = str(raw).strip().lower()
-    if not s or s in {"nan", "none"}:
-        return None
-
-    if any(k in s for k in ["windows", "win", "pc"]):
-        return "PC"
-    if "xbox" in s:
-        return "Xbox"
-    if any(k in s for k in ["playstation", "ps1", "ps2", "ps3", "ps4", "ps5", "ps vita"]):
-        return "PlayStation"
-    if "switch" in s or "nintendo" in s:
-        return "Nintendo Switch"
-    if "mac" in s or "macos" in s:
-        return "Mac"
-    if "linux" in s or "steamos" in s:
-        return "Linux"
-    if "android" in s:
-        return "Android"
-    if any(k in s for k in ["ios", "iphone", "ipad"]):
-        return "iOS"
-
-    return "Other"
-
-def normalize_platform(value):
+    masks = [
+        parts.str.contains(pattern).to_numpy(dtype=bool)
+        for _, pattern in PLATFORM_PATTERNS
+    ]
+    labels = [label for label, _ in PLATFORM_PATTERNS]
+    pairs = pd.DataFrame({
+        "row": parts.index,
+        "label": np.select(masks, labels, default="Other"),
+    }).drop_duplicates()
+    if pairs.empty:
+        return pd.Series("Other", index=platform.index, dtype=object)
+    pairs["pos"] = pairs.groupby("row", sort=False).cumcount()
+
+    # One column per label position; appending column by column keeps every
+    # step vectorized instead of joining each row's labels in Python.
+    wide = pairs.pivot(index="row", columns="pos", values="label")
+    joined = wide[0]
+    for pos in wide.columns[1:]:
+        nxt = wide[pos]
+        joined = joined.where(nxt.isna(), joined + " / " + nxt)
+    return joined.reindex(platform.index, fill_value="Other")
+
+def _vec_parse_price(series: pd.Series) -> tuple[pd.Series, pd.Series]:
     """
-    Handle multiple platforms like 'Windows, MacOS, Linux' by mapping each
-    and joining unique normalized labels with ' / '.
+    Split price strings like '₹3,249' into (value, currency) Series.
+    'Free' maps to (0.0, NA); missing or empty prices map to (nan, NA).
     """
-    if pd.isna(value):
-        return "Other"
-
-    text = str(value)
-
-    parts = [p.strip() for p in text.replace("/", ",").split(",") if p.strip()]
-    mapped = []
-    for p in parts:
-        m = map_single_platform(p)
-        if m and m not in mapped:
-            mapped.append(m)
-
-    if not mapped:
-        return "Other"
-    return " / ".join(mapped)
+    s = series.astype("string").str.strip()
+    free_mask = s.str.lower().str.startswith("free").fillna(False)
+    ex = s.str.extract(PRICE_RE)
+    value = (
+        pd.to_numeric(ex["number"].str.replace(",", "", regex=False), errors="coerce")
+        .astype("float64")
+        .mask(free_mask, 0.0)
+    )
+    currency = (
+        ex["currency"].where(ex["currency"].str.len() > 0, ex["suffix"])
+        .mask(free_mask, pd.NA)
+    )
+    return value, currency
 
 def clean_epic_games(df_raw: pd.DataFrame) -> pd.DataFrame:
     """
     Clean the Epic Games Store dataset.
     """
 
-    df = df_raw.copy()
-
-    price_tuples = df["price of game"].apply(parse_price)
-    df["price_numeric"], df["currency"] = zip(*price_tuples)
-
-    df["price_usd"] = [
-        convert_to_usd(v, c) for v, c in zip(df["price_numeric"], df["currency"])
-    ]
-
-    df["price_usd"] = df["price_usd"].round(2)
-
-    df["release_date_parsed"] = pd.to_datetime(
-        df["date release"], errors="coerce", format="%m/%d/%y"
-    )
+    price_numeric, currency = _vec_parse_price(df_raw["price of game"])
 
-    df["release_date_str"] = df["release_date_parsed"].dt.strftime("%Y-%m-%d")
+    is_inr = (currency.eq("₹") | currency.str.upper().eq("INR")).fillna(False)
+    price_usd = np.where(is_inr, price_numeric * INR_TO_USD, price_numeric).round(2)
 
-    df["critics_recommend_percent"] = df["Critics Recommend"].apply(parse_percent)
-
-    df["platform_normalized"] = df["platform"].apply(normalize_platform)
+    release_date = pd.to_datetime(
+        df_raw["date release"], errors="coerce", format="%m/%d/%y", cache=True
+    ).dt.strftime("%Y-%m-%d")
 
     df_clean = pd.DataFrame(
         {
             "store": "epic_games_store",  
-            "title": df["name"].astype(str).str.strip(),
-            "platform": df["platform_normalized"],
+            "title": df_raw["name"].str.strip(),
+            "platform": normalize_platform_column(df_raw["platform"]),
 
-            "price": df["price_usd"],
-            "release_date": df["release_date_str"],
+            "price": price_usd,
+            "release_date": release_date,
         }
     )
 
     df_clean = df_clean.dropna(subset=["title"]).reset_index(drop=True)
 
-    return df_clean
+    return downcast_prices(df_clean)
 
-def main():
+def main(fmt="csv"):
     print("=======================================")
     print("🎮  Epic Games CLEANER STARTED")
     print("=======================================")
 
     print(f"📥 Loading raw data from: {RAW_PATH}")
-    df_raw = pd.read_csv(RAW_PATH)
-    print(f"   ➜ Raw shape: {df_raw.shape}")
-
-    df_clean = clean_epic_games(df_raw)
-    print(f"✅ Cleaned shape: {df_clean.shape}")
+    chunks = pd.read_csv(
+        RAW_PATH, usecols=RAW_COLUMNS, dtype="string", chunksize=CHUNK_SIZE
+    )
 
     CLEAN_PATH.parent.mkdir(parents=True, exist_ok=True)
-    df_clean.to_csv(CLEAN_PATH, index=False, encoding="utf-8")
-    print(f"💾 Saved cleaned data to: {CLEAN_PATH}")
+
+    raw_rows = 0
+    clean_rows = 0
+    # This file has always been written without a BOM.
+    with output_writer(CLEAN_PATH, fmt, bom=False) as write:
+        for df_raw in chunks:
+            raw_rows += len(df_raw)
+            df_clean = clean_epic_games(df_raw)
+            write(df_clean)
+            clean_rows += len(df_clean)
+
+    print(f"   ➜ Raw rows: {raw_rows}")
+    print(f"✅ Cleaned rows: {clean_rows}")
+    print(f"💾 Saved cleaned data to: {output_path(CLEAN_PATH, fmt)}")
     print("✅ Done.")
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Epic Games Cleaner")
+    parser.add_argument("--parquet", action="store_true", help="Write cleaned data as Parquet instead of CSV")
+    args = parser.parse_args()
+
+    main(fmt="parquet" if args.parquet else "csv")
@@ -9,11 +9,19 @@ sharing as many fields as possible with other scrapers.
 import re
 import sys
 from pathlib import Path
-from datetime import datetime
 
 import numpy as np
 import pandas as pd
 
+from _common import (
+    PRICE_JUNK_RE,
+    downcast_prices,
+    drop_seen,
+    output_path,
+    output_writer,
+    parse_discount_vec,
+)
+
 RAW_CANDIDATES = [
     Path("data/raw/gog.csv"),
     Path("data/raw/gog_products.csv"),
@@ -23,124 +31,94 @@ RAW_CANDIDATES = [
 OUTPUT_DIR = Path("data/cleaned")
 OUTPUT_PATH = OUTPUT_DIR / "cleaned_gog.csv"
 
-def parse_price(text):
-    """
-    Convert price strings to float.
-    Handles 'Free', currency symbols, and standard number formats.
-    """
-    if pd.isna(text):
-        return np.nan
-    s = str(text).strip()
-
-    if "free" in s.lower():
-        return 0.0
-
-    if s.upper() == 'N/A':
-        return np.nan
+CHUNK_SIZE = 200_000
 
-    s_clean = re.sub(r"[^\d.,\-]", "", s)
+# Raw columns the cleaner actually reads; anything else in the scrape is skipped at load.
+RAW_COLUMNS = {
+    "product_id", "url", "title", "price_final", "price_base",
+    "discount_percentage", "release_date", "review_score", "genres", "tags",
+}
+# All strings except review_score, which the cleaned file has always written as a float (36.0).
+RAW_DTYPES = {c: "string" for c in RAW_COLUMNS} | {"review_score": "float64"}
 
-    if not s_clean:
-        return np.nan
+DATE_SEP_RE = re.compile(r"[T ]")
 
-    if s_clean.count(".") == 1 and s_clean.count(",") >= 1:
-        s_clean = s_clean.replace(",", "")
-    elif s_clean.count(",") == 1 and s_clean.count(".") == 0:
-        s_clean = s_clean.replace(",", ".")
-
-    try:
-        return float(s_clean)
-    except ValueError:
-        return np.nan
-
-def parse_discount_pct(val):
+def _vec_parse_price(series):
     """
-    Convert discount to positive float percentage.
+    Convert price strings to float for a whole column.
+    Handles 'Free', 'N/A', currency symbols, and standard number formats.
     """
-    if pd.isna(val):
-        return 0.0
-
-    if isinstance(val, (int, float)):
-        return float(abs(val))
-
-    s = str(val).strip()
-    if not s or s.upper() == 'N/A':
-        return 0.0
-
-    m = re.search(r"(-?\d+)", s)
-    if not m:
-        return 0.0
-    return float(abs(float(m.group(1))))
-
-def parse_date(date_str):
-    """
-    Attempt to parse date string to YYYY-MM-DD.
-    """
-    if pd.isna(date_str) or str(date_str).strip().upper() == 'N/A':
-        return None
-
-    s = str(date_str).strip()
-    try:
+    s = series.astype("string").str.strip()
+    free = s.str.contains("free", case=False, na=False)
+    na = s.str.upper().eq("N/A").fillna(False)
+
+    s2 = s.str.replace(PRICE_JUNK_RE, "", regex=True)
+    nd = s2.str.count(r"\.")
+    nc = s2.str.count(",")
+    thousands = ((nd == 1) & (nc >= 1)).fillna(False)
+    decimal_comma = ((nc == 1) & (nd == 0)).fillna(False)
+    s2 = s2.mask(thousands, s2.str.replace(",", "", regex=False)).mask(
+        decimal_comma, s2.str.replace(",", ".", regex=False)
+    )
 
-        if 'T' in s:
-            s = s.split('T')[0]
-        elif ' ' in s:
-            s = s.split(' ')[0]
+    out = pd.to_numeric(s2, errors="coerce").astype("float64")
+    return out.mask(free, 0.0).mask(na, np.nan)
 
-        datetime.strptime(s, "%Y-%m-%d")
-        return s
-    except ValueError:
-        return None
+def read_raw_csv(path, chunksize=CHUNK_SIZE):
+    return pd.read_csv(
+        path, usecols=lambda c: c in RAW_COLUMNS, dtype=RAW_DTYPES, chunksize=chunksize
+    )
 
-def load_raw_csv():
+def load_raw_csv(chunksize=CHUNK_SIZE):
+    """Return a chunk iterator over the first raw GOG CSV that exists."""
     for p in RAW_CANDIDATES:
         if p.exists():
             print(f"📥 Loading raw GOG data from: {p}")
-            return pd.read_csv(p)
+            return read_raw_csv(p, chunksize)
 
     parent_candidates = [Path("../") / p for p in RAW_CANDIDATES]
     for p in parent_candidates:
         if p.exists():
             print(f"📥 Loading raw GOG data from: {p}")
-            return pd.read_csv(p)
+            return read_raw_csv(p, chunksize)
 
     raise FileNotFoundError(
         "GOG data file not found in expected locations."
     )
 
-def main():
-    try:
-        df = load_raw_csv()
-    except FileNotFoundError as e:
-        print(f"❌ {e}")
-        sys.exit(1)
-
-    print(f"🔹 Raw shape: {df.shape}")
-
+def clean_gog(df, seen_keys):
+    """Clean one raw chunk; seen_keys carries dedup state across chunks."""
     if "product_id" in df.columns:
-        df = df.drop_duplicates(subset=["product_id"])
+        df = drop_seen(df, "product_id", seen_keys)
     elif "url" in df.columns:
-        df = df.drop_duplicates(subset=["url"])
-
-    print(f"🔹 Shape after deduplication: {df.shape}")
+        df = drop_seen(df, "url", seen_keys)
 
     if "price_final" in df.columns:
-        df["price_usd"] = df["price_final"].apply(parse_price)
+        df["price_usd"] = _vec_parse_price(df["price_final"])
     else:
         df["price_usd"] = np.nan
 
     if "price_base" in df.columns:
-        df["original_price_usd"] = df["price_base"].apply(parse_price)
+        df["original_price_usd"] = _vec_parse_price(df["price_base"])
     else:
         df["original_price_usd"] = np.nan
 
     if "discount_percentage" in df.columns:
-        df["discount_pct"] = df["discount_percentage"].apply(parse_discount_pct)
+        df["discount_pct"] = parse_discount_vec(df["discount_percentage"])
     else:
         df["discount_pct"] = 0.0
 
     if "release_date" in df.columns:
-        df["release_date"] = df["release_date"].apply(parse_date)
+        date_token = (
+            df["release_date"]
+            .astype("string")
+            .str.strip()
+            .str.split(DATE_SEP_RE, n=1, regex=True)
+            .str[0]
+        )
+        df["release_date"] = pd.to_datetime(
+            date_token, errors="coerce", format="%Y-%m-%d", cache=True
+        ).dt.strftime("%Y-%m-%d")
 
     df["source"] = "gog"
     df["storefront"] = "GOG"
@@ -161,18 +139,45 @@ def main():
             keep_cols.append(col)
 
     final_cols = [c for c in keep_cols if c in df.columns]
-    cleaned = df[final_cols].copy()
+    cleaned = df[final_cols]
 
     cleaned = cleaned.dropna(subset=["title"])
 
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    return downcast_prices(cleaned)
 
-    cleaned.to_csv(OUTPUT_PATH, index=False, encoding="utf-8-sig")
+def main(fmt="csv"):
+    try:
+        chunks = load_raw_csv()
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
 
-    print(f"✅ Saved cleaned GOG data to: {OUTPUT_PATH}")
-    print(f"✅ Final shape: {cleaned.shape}")
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    seen_keys = set()
+    raw_rows = 0
+    final_rows = 0
+    preview = None
+    with output_writer(OUTPUT_PATH, fmt) as write:
+        for chunk in chunks:
+            raw_rows += len(chunk)
+            cleaned = clean_gog(chunk, seen_keys)
+            write(cleaned)
+            final_rows += len(cleaned)
+            if preview is None:
+                preview = cleaned.head()
+
+    print(f"🔹 Raw rows: {raw_rows}")
+    print(f"✅ Saved cleaned GOG data to: {output_path(OUTPUT_PATH, fmt)}")
+    print(f"✅ Final rows: {final_rows}")
     print("\n🔎 Preview:")
-    print(cleaned.head())
+    print(preview)
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="GOG Cleaner")
+    parser.add_argument("--parquet", action="store_true", help="Write cleaned data as Parquet instead of CSV")
+    args = parser.parse_args()
+
+    main(fmt="parquet" if args.parquet else "csv")
@@ -11,6 +11,17 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 
+from _common import (
+    EUR_TO_USD_RATE,
+    PRICE_JUNK_RE,
+    compute_original_price_vec,
+    downcast_prices,
+    drop_seen,
+    output_path,
+    output_writer,
+    parse_discount_vec,
+)
+
 RAW_CANDIDATES = [
     Path("data/raw/instantgaming.csv"),
     Path("instantgaming.csv"),
@@ -20,128 +31,72 @@ RAW_CANDIDATES = [
 OUTPUT_DIR = Path("data/cleaned")
 OUTPUT_PATH = OUTPUT_DIR / "cleaned_instantgaming.csv"
 
-EUR_TO_USD_RATE = 1.08
-
-def parse_price_eur(text):
-    """Convert a price string like '55.49 €' or '55,49 €' to float euros."""
-    if pd.isna(text):
-        return np.nan
-    s = str(text).replace("\xa0", " ").strip()
-
-    s_clean = re.sub(r"[^\d,.\-]", "", s)
-
-    if not s_clean:
-        return np.nan
-
-    if s_clean.count(",") == 1 and s_clean.count(".") == 0:
-        s_clean = s_clean.replace(",", ".")
-
-    if s_clean.count(".") == 1 and s_clean.count(",") >= 1:
-        s_clean = s_clean.replace(",", "")
-
-    try:
-        return float(s_clean)
-    except ValueError:
-        return np.nan
-
-def parse_discount_pct(text):
-    """
-    Convert strings like '-31%' or '31%' to a positive float (31.0).
-    If missing, return 0.0.
-    """
-    if pd.isna(text):
-        return 0.0
-    s = str(text)
-    m = re.search(r"(-?\d+)", s)
-    if not m:
-        return 0.0
-    val = float(m.group(1))
-    return abs(val)
-
-def compute_original_price(price, discount_pct):
-    """
-    Estimate original price from current price and discount percentage.
-    If discount_pct <= 0, just return price.
-    """
-    if pd.isna(price):
-        return np.nan
-    if discount_pct is None or discount_pct <= 0:
-        return price
-    try:
-        orig = price / (1 - discount_pct / 100.0)
-        return round(orig, 2)
-    except ZeroDivisionError:
-        return price
-
-def extract_platform_and_storefront(title: str):
-    """
-    Try to infer platform (PC/PS/Xbox/Switch/Unknown)
-    and storefront (Steam, EA App, Microsoft Store, etc.)
-    from the game title.
-    """
-    s = str(title)
-
-    storefront = None
-    m = re.search(r"\(([^)]+)\)\s*$", s)
-    if m:
-        storefront = m.group(1).strip()
-
-    platform = None
-    patterns = {
-        "PC": ["- PC", " PC ", "PC -"],
-        "PS5": ["PS5", "PlayStation 5"],
-        "PS4": ["PS4", "PlayStation 4"],
-        "Xbox One/Series": ["Xbox One/Series X|S", "Xbox Series X|S", "Xbox One"],
-        "Xbox 360": ["Xbox 360"],
-        "Switch": ["Nintendo Switch", "Switch"],
-    }
-
-    for plat, needles in patterns.items():
-        for n in needles:
-            if n in s:
-                platform = plat
-                break
-        if platform:
-            break
-
-    if platform is None:
-        if "PC" in s:
-            platform = "PC"
-        else:
-            platform = "Unknown"
-
-    return platform, storefront
-
-def load_raw_csv():
+CHUNK_SIZE = 200_000
+
+
+EXPECTED_COLUMNS = [
+    "source", "title", "discount", "price_raw", "preorder_info", "product_url",
+]
+
+STOREFRONT_RE = re.compile(r"\(([^)]+)\)\s*$")
+
+# Checked in order and the first match wins; bare "PC" is the last resort.
+PLATFORM_PATTERNS = [
+    ("PC", re.compile(r"- PC| PC |PC -")),
+    ("PS5", re.compile(r"PS5|PlayStation 5")),
+    ("PS4", re.compile(r"PS4|PlayStation 4")),
+    ("Xbox One/Series", re.compile(r"Xbox One/Series X\|S|Xbox Series X\|S|Xbox One")),
+    ("Xbox 360", re.compile(r"Xbox 360")),
+    ("Switch", re.compile(r"Nintendo Switch|Switch")),
+    ("PC", re.compile(r"PC")),
+]
+
+def _vec_parse_price_eur(series):
+    """Convert price strings like '55.49 €' or '55,49 €' to float euros, column-wide."""
+    s = series.astype("string").str.replace("\xa0", " ", regex=False).str.strip()
+    s = s.str.replace(PRICE_JUNK_RE, "", regex=True)
+
+    nd = s.str.count(r"\.")
+    nc = s.str.count(",")
+    decimal_comma = ((nc == 1) & (nd == 0)).fillna(False)
+    thousands = ((nd == 1) & (nc >= 1)).fillna(False)
+    s = s.mask(decimal_comma, s.str.replace(",", ".", regex=False)).mask(
+        thousands, s.str.replace(",", "", regex=False)
+    )
+
+    return pd.to_numeric(s, errors="coerce").astype("float64")
+
+def load_raw_csv(chunksize=CHUNK_SIZE):
+    """Return a chunk iterator over the first raw Instant Gaming CSV that exists."""
     for p in RAW_CANDIDATES:
         if p.exists():
             print(f"📥 Loading raw Instant Gaming data from: {p}")
-            return pd.read_csv(p)
+            return pd.read_csv(
+                p,
+                usecols=lambda c: c in EXPECTED_COLUMNS,
+                dtype="string",
+                chunksize=chunksize,
+            )
     raise FileNotFoundError(
         "instantgaming.csv not found in any of: "
         + ", ".join(str(p) for p in RAW_CANDIDATES)
     )
 
-def main():
-    df = load_raw_csv()
-    print(f"🔹 Raw shape: {df.shape}")
-
-    expected_cols = ["source", "title", "discount", "price_raw", "preorder_info", "product_url"]
-    missing = [c for c in expected_cols if c not in df.columns]
+def clean_instantgaming(df, seen_urls):
+    """Clean one raw chunk; seen_urls carries dedup state across chunks."""
+    missing = [c for c in EXPECTED_COLUMNS if c not in df.columns]
     if missing:
         raise ValueError(f"Missing expected columns in raw CSV: {missing}")
 
     before = len(df)
-    df = df.drop_duplicates(subset=["product_url"]).copy()
+    df = drop_seen(df, "product_url", seen_urls)
     after = len(df)
     print(f"🧹 Removed {before - after} duplicate rows based on product_url")
 
-    df["price_eur"] = df["price_raw"].apply(parse_price_eur)
-    df["discount_pct"] = df["discount"].apply(parse_discount_pct)
-
-    df["original_price_eur"] = df.apply(
-        lambda row: compute_original_price(row["price_eur"], row["discount_pct"]),
-        axis=1,
+    df["price_eur"] = _vec_parse_price_eur(df["price_raw"])
+    df["discount_pct"] = parse_discount_vec(df["discount"])
+    df["original_price_eur"] = compute_original_price_vec(
+        df["price_eur"], df["discount_pct"]
     )
 
     df["price_usd"] = (df["price_eur"] * EUR_TO_USD_RATE).round(2)
@@ -150,9 +105,16 @@ def main():
         "pre-order", case=False, na=False
     )
 
-    plat_store = df["title"].apply(extract_platform_and_storefront)
-    df["platform"] = plat_store.apply(lambda x: x[0])
-    df["storefront"] = plat_store.apply(lambda x: x[1])
+    titles = df["title"].astype("string")
+    df["platform"] = np.select(
+        [
+            titles.str.contains(pattern, na=False).to_numpy(dtype=bool)
+            for _, pattern in PLATFORM_PATTERNS
+        ],
+        [label for label, _ in PLATFORM_PATTERNS],
+        default="Unknown",
+    )
+    df["storefront"] = titles.str.extract(STOREFRONT_RE, expand=False).str.strip()
 
     before = len(df)
     df = df.dropna(subset=["price_eur", "product_url"])
@@ -172,15 +134,39 @@ def main():
             "discount_pct",          
             "product_url",           
         ]
-    ].copy()
+    ]
+
+    return downcast_prices(cleaned)
+
+def main(fmt="csv"):
+    chunks = load_raw_csv()
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-    cleaned.to_csv(OUTPUT_PATH, index=False, encoding="utf-8-sig")
-    print(f"✅ Saved cleaned Instant Gaming data to: {OUTPUT_PATH}")
-    print(f"✅ Final shape: {cleaned.shape}")
+    seen_urls = set()
+    raw_rows = 0
+    final_rows = 0
+    preview = None
+    with output_writer(OUTPUT_PATH, fmt) as write:
+        for chunk in chunks:
+            raw_rows += len(chunk)
+            cleaned = clean_instantgaming(chunk, seen_urls)
+            write(cleaned)
+            final_rows += len(cleaned)
+            if preview is None:
+                preview = cleaned.head()
+
+    print(f"🔹 Raw rows: {raw_rows}")
+    print(f"✅ Saved cleaned Instant Gaming data to: {output_path(OUTPUT_PATH, fmt)}")
+    print(f"✅ Final rows: {final_rows}")
     print("\n🔎 Preview:")
-    print(cleaned.head())
+    print(preview)
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Instant Gaming Cleaner")
+    parser.add_argument("--parquet", action="store_true", help="Write cleaned data as Parquet instead of CSV")
+    args = parser.parse_args()
+
+    main(fmt="parquet" if args.parquet else "csv")
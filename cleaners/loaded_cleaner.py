@@ -18,6 +18,8 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 
+from _common import downcast_prices, drop_seen, output_path, output_writer
+
 RAW_CANDIDATES = [
     Path("data/raw/loaded.csv"),
     Path("loaded.csv"),
@@ -26,9 +28,25 @@ RAW_CANDIDATES = [
 OUTPUT_DIR = Path("data/cleaned")
 OUTPUT_PATH = OUTPUT_DIR / "cleaned_loaded.csv"
 
+CHUNK_SIZE = 200_000
+
 GBP_TO_EUR = 1.17
 EUR_TO_USD = 1.08
 
+RAW_COLUMNS = ["title", "price_raw", "product_url", "scraped_at", "category"]
+
+PRICE_GBP_RE = re.compile(r"(\d+(?:\.\d+)?)")
+
+# Matched against " " + lowercased title + " ", so word edges are plain spaces.
+PLAYSTATION_RE = re.compile(r" ps5 | ps4 | ps3 | playstation | ps vita | ps vr ")
+PC_RE = re.compile(r" pc | \(pc|steam")
+PREORDER_RE = re.compile(r"pre[- ]?order")
+
+# ISO timestamps already in UTC (or naive) can be reformatted without parsing.
+UTC_STAMP_RE = re.compile(
+    r"^(\d{4}-\d{2}-\d{2})[T ](\d{2}:\d{2}:\d{2})(?:\.\d+)?(?:Z|[+-]00:?00)?$"
+)
+
 def find_raw_path(candidates=RAW_CANDIDATES) -> Path:
     """Return the first existing path from the candidates list, or raise if none exist."""
     for p in candidates:
@@ -38,75 +56,23 @@ def find_raw_path(candidates=RAW_CANDIDATES) -> Path:
         f"❌ Could not find raw Loaded data. Tried: {[str(p) for p in candidates]}"
     )
 
-def clean_price_gbp(value):
+def clean_loaded(df_raw: pd.DataFrame, seen_urls: set | None = None) -> pd.DataFrame:
     """
-    Convert a price string like '£25.99' into a float 25.99 (GBP).
-    Returns NaN if parsing fails.
+    Apply cleaning steps to the Loaded dataset and return unified columns.
+    Pass the same seen_urls set for every chunk to deduplicate across chunks.
     """
-    if pd.isna(value):
-        return np.nan
-
-    text = str(value).strip()
-
-    for sym in ["£", "$", "€"]:
-        text = text.replace(sym, "")
-
-    match = re.findall(r"[0-9]+(?:\.[0-9]+)?", text)
-    if not match:
-        return np.nan
-
-    try:
-        return float(match[0])
-    except ValueError:
-        return np.nan
-
-def infer_platform(title: str) -> str:
-    """
-    Guess platform from the game title text.
-
-    Returns one of: 'PC', 'Xbox', 'PlayStation', 'Nintendo Switch', 'Unknown'
-    """
-    if not isinstance(title, str):
-        return "Unknown"
-
-    t = title.lower()
-    padded = f" {t} "
-
-    if "xbox" in padded:
-        return "Xbox"
-
-    if any(x in padded for x in [" ps5 ", " ps4 ", " ps3 ", " playstation ", " ps vita ", " ps vr "]):
-        return "PlayStation"
-
-    if "switch" in padded or " nintendo " in padded:
-        return "Nintendo Switch"
-
-    if " pc " in padded or padded.strip().endswith(" pc") or " (pc" in padded:
-        return "PC"
-
-    if "steam" in padded:
-        return "PC"
-
-    return "Unknown"
-
-def infer_is_preorder(title: str) -> bool:
-    """True if title mentions pre-order / preorder / pre order."""
-    if not isinstance(title, str):
-        return False
-    t = title.lower()
-    return ("pre-order" in t) or ("preorder" in t) or ("pre order" in t)
-
-def clean_loaded(df_raw: pd.DataFrame) -> pd.DataFrame:
-    """Apply cleaning steps to the Loaded dataset and return unified columns."""
     df = df_raw.copy()
 
     df["source"] = "loaded.com"
 
-    df["title"] = df["title"].astype(str).str.strip()
-    df["product_url"] = df["product_url"].astype(str).str.strip()
-    df["category"] = df["category"].astype(str).str.strip().str.lower()
+    df["title"] = df["title"].str.strip()
+    df["product_url"] = df["product_url"].str.strip()
+    df["category"] = df["category"].str.strip().str.lower()
 
-    df["price_gbp"] = df["price_raw"].map(clean_price_gbp)
+    df["price_gbp"] = pd.to_numeric(
+        df["price_raw"].astype("string").str.extract(PRICE_GBP_RE, expand=False),
+        errors="coerce",
+    ).astype("float64")
 
     before = len(df)
     df = df[df["price_gbp"].notna() & (df["price_gbp"] > 0)]
@@ -118,16 +84,33 @@ def clean_loaded(df_raw: pd.DataFrame) -> pd.DataFrame:
     df["discount_pct"] = 0.0
     df["original_price_eur"] = df["price_eur"]
 
-    df["platform"] = df["title"].map(infer_platform)
+    padded = " " + df["title"].str.lower().fillna("") + " "
+    platform_masks = [
+        padded.str.contains("xbox", regex=False),
+        padded.str.contains(PLAYSTATION_RE),
+        padded.str.contains("switch", regex=False)
+        | padded.str.contains(" nintendo ", regex=False),
+        padded.str.contains(PC_RE),
+    ]
+    df["platform"] = np.select(
+        [m.to_numpy(dtype=bool) for m in platform_masks],
+        ["Xbox", "PlayStation", "Nintendo Switch", "PC"],
+        default="Unknown",
+    )
     df["storefront"] = "Loaded/CDKeys"
-    df["is_preorder"] = df["title"].map(infer_is_preorder)
+    df["is_preorder"] = padded.str.contains(PREORDER_RE)
 
-    df["scraped_at"] = pd.to_datetime(df["scraped_at"], errors="coerce", utc=True)
-
-    df["scraped_at_utc"] = df["scraped_at"].dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+    stamp = df["scraped_at"].str.strip().str.extract(UTC_STAMP_RE)
+    scraped_at_utc = stamp[0] + "T" + stamp[1] + "Z"
+    needs_parse = scraped_at_utc.isna() & df["scraped_at"].notna()
+    if needs_parse.any():
+        scraped_at_utc[needs_parse] = pd.to_datetime(
+            df.loc[needs_parse, "scraped_at"], errors="coerce", utc=True
+        ).dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+    df["scraped_at_utc"] = scraped_at_utc
 
     before_dup = len(df)
-    df = df.drop_duplicates(subset=["product_url"])
+    df = drop_seen(df, "product_url", set() if seen_urls is None else seen_urls)
     after_dup = len(df)
 
     cols = [
@@ -144,32 +127,50 @@ def clean_loaded(df_raw: pd.DataFrame) -> pd.DataFrame:
         "category",             
         "scraped_at_utc",       
     ]
-    df = df[cols]
+    df = downcast_prices(df[cols])
 
     print(f"   🔹 Dropped {before - after_price} rows with invalid price.")
     print(f"   🔹 Dropped {before_dup - after_dup} duplicate product_url rows.")
     return df
 
-def main():
+def main(fmt="csv"):
     raw_path = find_raw_path()
     print("=======================================")
     print("🎮  Loaded.com CLEANER STARTED")
     print("=======================================")
     print(f"📥 Loading raw data from: {raw_path}")
 
-    df_raw = pd.read_csv(raw_path)
-    print(f"   ➜ Raw shape: {df_raw.shape}")
-
-    df_clean = clean_loaded(df_raw)
+    chunks = pd.read_csv(
+        raw_path,
+        usecols=lambda c: c in RAW_COLUMNS,
+        dtype="string",
+        chunksize=CHUNK_SIZE,
+    )
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    df_clean.to_csv(OUTPUT_PATH, index=False, encoding="utf-8-sig")
 
-    print(f"\n✅ Cleaned data saved to: {OUTPUT_PATH}")
-    print(f"   ➜ Cleaned shape: {df_clean.shape}")
+    seen_urls = set()
+    raw_rows = 0
+    clean_rows = 0
+    with output_writer(OUTPUT_PATH, fmt) as write:
+        for df_raw in chunks:
+            raw_rows += len(df_raw)
+            df_clean = clean_loaded(df_raw, seen_urls)
+            write(df_clean)
+            clean_rows += len(df_clean)
+
+    print(f"   ➜ Raw rows: {raw_rows}")
+    print(f"\n✅ Cleaned data saved to: {output_path(OUTPUT_PATH, fmt)}")
+    print(f"   ➜ Cleaned rows: {clean_rows}")
     print("=======================================")
     print("✅ DONE")
     print("=======================================")
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Loaded/CDKeys Cleaner")
+    parser.add_argument("--parquet", action="store_true", help="Write cleaned data as Parquet instead of CSV")
+    args = parser.parse_args()
+
+    main(fmt="parquet" if args.parquet else "csv")
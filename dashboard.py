@@ -3,8 +3,14 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import os
+from concurrent.futures import ThreadPoolExecutor
 import pickle
+import uuid
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 
 st.set_page_config(
     page_title="Game Deals Tracker",
@@ -153,10 +159,99 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data
-def load_data():
+# The game list only ships this many rows to the browser.
+TABLE_ROW_LIMIT = 1000
+# The deal scatter plots at most this many points per store, sampled reproducibly.
+SCATTER_POINTS_PER_STORE = 1000
+
+# Columns the dashboard and the deal predictor read; 'price' is Epic's price_eur.
+DASHBOARD_COLUMNS = [
+    'title', 'price_eur', 'price', 'discount_pct', 'platform',
+    'storefront', 'category', 'is_preorder', 'product_url',
+]
+
+# Every store's table is cast to this schema, so they concatenate without promotion.
+DASHBOARD_SCHEMA = pa.schema([
+    ('title', pa.string()),
+    ('price_eur', pa.float32()),
+    ('discount_pct', pa.float32()),
+    ('platform', pa.string()),
+    ('storefront', pa.string()),
+    ('category', pa.string()),
+    ('is_preorder', pa.bool_()),
+    ('product_url', pa.string()),
+])
+
+# Missing prices and discounts count as 0, filled in Arrow before conversion.
+NULL_FILLS = {'price_eur': 0.0, 'discount_pct': 0.0}
+
+# Parsed straight to these Arrow types instead of being coerced after loading.
+NUMERIC_TYPES = {'price_eur': pa.float32(), 'price': pa.float32(), 'discount_pct': pa.float32()}
+
+def read_cleaned_file(filepath):
+    if filepath.endswith(".parquet"):
+        names = pq.read_schema(filepath).names
+        columns = [c for c in names if c in DASHBOARD_COLUMNS]
+        return pq.read_table(filepath, columns=columns)
+
+    header = pd.read_csv(filepath, nrows=0).columns
+    columns = [c for c in header if c in DASHBOARD_COLUMNS]
+    table = pacsv.read_csv(
+        filepath,
+        read_options=pacsv.ReadOptions(block_size=8 << 20),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=columns,
+            column_types={c: t for c, t in NUMERIC_TYPES.items() if c in columns},
+        ),
+    )
+    return table
+
+def normalize_table(table, source):
+    """Cast one store's table to DASHBOARD_SCHEMA, null-filling missing columns, and tag its store."""
+    n = table.num_rows
+    columns = []
+    for f in DASHBOARD_SCHEMA:
+        col = table[f.name].cast(f.type) if f.name in table.column_names else pa.nulls(n, f.type)
+        if f.name in NULL_FILLS:
+            col = pc.fill_null(col, NULL_FILLS[f.name])
+        columns.append(col)
+    table = pa.Table.from_arrays(columns, schema=DASHBOARD_SCHEMA)
+    return table.append_column('source_file', pa.array([source] * n).dictionary_encode())
+
+# Bump when load_data changes the combined frame, so stale Parquet caches are ignored.
+COMBINED_CACHE_VERSION = 5
+# Columns kept in (and read back from) the combined cache.
+COMBINED_COLUMNS = DASHBOARD_SCHEMA.names + ['source_file', 'title_lower']
+COMBINED_ROW_GROUP_SIZE = 262_144
+# Low-cardinality labels kept as int8-coded categoricals for filtering and grouping.
+CATEGORY_COLUMNS = ('source_file', 'platform', 'storefront')
+# Arrow-backed strings, so the title search runs in Arrow's C kernel on pandas 2 as well.
+TITLE_DTYPE = "string[pyarrow]"
+
+def read_store_table(source, filepath):
+    """Read one store's cleaned file as a DASHBOARD_SCHEMA table."""
+    table = read_cleaned_file(filepath)
+
+    if source == "Epic Games":
+        if 'price' in table.column_names:
+            table = table.rename_columns(
+                ['price_eur' if c == 'price' else c for c in table.column_names]
+            )
+
+    return normalize_table(table, source)
+
+def with_load_attrs(df):
+    """Store the slider's price bound, the store -> category code map and a load token on the frame."""
+    # Survives st.cache_data's copies, so cached views can key on it instead of hashing every row.
+    df.attrs['load_token'] = uuid.uuid4().hex
+    df.attrs['price_max'] = round(float(df['price_eur'].max()), 2)
+    df.attrs['store_codes'] = {s: i for i, s in enumerate(df['source_file'].cat.categories)}
+    return df
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def load_data(cache_version=COMBINED_CACHE_VERSION):
     data_dir = "data/cleaned"
-    datasets = []
+    tables = []
 
     files = {
         "Steam": "cleaned_steam.csv",
@@ -165,57 +260,112 @@ def load_data():
         "Loaded": "cleaned_loaded.csv",
         "Xbox": "cleaned_xbox.csv"
     }
-
+    existing_files = {}
     for source, filename in files.items():
-        filepath = os.path.join(data_dir, filename)
-        if os.path.exists(filepath):
+        csv_path = os.path.join(data_dir, filename)
+        parquet_path = os.path.splitext(csv_path)[0] + ".parquet"
+        # Prefer a cleaner's Parquet output unless the CSV was written after it.
+        if os.path.exists(parquet_path) and (
+            not os.path.exists(csv_path)
+            or os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)
+        ):
+            existing_files[source] = parquet_path
+        elif os.path.exists(csv_path):
+            existing_files[source] = csv_path
+
+    # Reuse the combined frame from the last run while no cleaned CSV is newer.
+    cache_path = os.path.join(data_dir, f"combined_v{cache_version}.parquet")
+    if existing_files and os.path.exists(cache_path):
+        stamp = max(os.path.getmtime(fp) for fp in existing_files.values())
+        if os.path.getmtime(cache_path) >= stamp:
             try:
-                df = pd.read_csv(filepath)
-                df['source_file'] = source
-
-                if source == "Epic Games":
-                    if 'price' in df.columns:
-                        df.rename(columns={'price': 'price_eur'}, inplace=True)
-
-                required_cols = ['price_eur', 'discount_pct', 'title', 'platform', 'product_url']
-                for col in required_cols:
-                    if col not in df.columns:
-                        if col == 'discount_pct':
-                            df[col] = 0
-                        elif col == 'price_eur':
-                            df[col] = 0.0
-                        else:
-                            df[col] = None
-
-                df['price_eur'] = pd.to_numeric(df['price_eur'], errors='coerce').fillna(0.0)
-                df['discount_pct'] = pd.to_numeric(df['discount_pct'], errors='coerce').fillna(0)
-
-                datasets.append(df)
-            except Exception as e:
-                st.error(f"Error loading {filename}: {e}")
-
-    if datasets:
-        combined_df = pd.concat(datasets, ignore_index=True)
-        return combined_df
+                cached_df = pq.read_table(cache_path, columns=COMBINED_COLUMNS).to_pandas()
+                if set(cached_df['source_file'].unique()) == set(existing_files):
+                    # Parquet restores pandas' default string storage, which may not be Arrow.
+                    cached_df['title_lower'] = cached_df['title_lower'].astype(TITLE_DTYPE)
+                    return with_load_attrs(cached_df)
+            except Exception:
+                pass
+
+    # Parsing releases the GIL, so the stores are read side by side.
+    futures = {}
+    if existing_files:
+        with ThreadPoolExecutor(max_workers=len(existing_files)) as pool:
+            futures = {
+                source: pool.submit(read_store_table, source, filepath)
+                for source, filepath in existing_files.items()
+            }
+
+    # Streamlit calls must stay on the script thread, so errors are reported here.
+    for source, future in futures.items():
+        try:
+            tables.append(future.result())
+        except Exception as e:
+            st.error(f"Error loading {os.path.basename(existing_files[source])}: {e}")
+
+    if tables:
+        # One concat in Arrow and one conversion, instead of a pandas concat of per-store frames.
+        combined = pa.concat_tables(tables)
+        # Dictionary-encoded here, these convert straight to categoricals without a pandas pass.
+        for col in CATEGORY_COLUMNS:
+            i = combined.schema.get_field_index(col)
+            combined = combined.set_column(i, col, pc.dictionary_encode(combined[col]))
+        combined_df = combined.to_pandas()
+        # price_eur already arrives as float32; discounts are whole percents.
+        combined_df['discount_pct'] = pd.to_numeric(combined_df['discount_pct'], downcast='integer')
+        combined_df['title_lower'] = combined_df['title'].astype(TITLE_DTYPE).str.lower()
+        if len(tables) == len(existing_files):
+            try:
+                pq.write_table(
+                    pa.Table.from_pandas(combined_df[COMBINED_COLUMNS], preserve_index=False),
+                    cache_path,
+                    compression="zstd",
+                    row_group_size=COMBINED_ROW_GROUP_SIZE,
+                )
+            except Exception:
+                pass
+        return with_load_attrs(combined_df)
     return pd.DataFrame()
 
 df = load_data()
 
+def load_model_file(models_dir, filename):
+    """Unpickle a model, preferring the memory-mapped .joblib copy written by utils/repickle_models.py."""
+    path = os.path.join(models_dir, filename)
+    joblib_path = os.path.splitext(path)[0] + ".joblib"
+    # Skip a .joblib copy that is older than a retrained .pkl.
+    if os.path.exists(joblib_path) and os.path.getmtime(joblib_path) >= os.path.getmtime(path):
+        try:
+            import joblib
+        except ImportError:
+            pass
+        else:
+            return joblib.load(joblib_path, mmap_mode='r')
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
 @st.cache_resource
 def load_models():
     models_dir = "models"
     try:
-        deal_classifier = pickle.load(open(os.path.join(models_dir, "best_model_deal_classifier_Gradient_Boosting.pkl"), "rb"))
-        price_regressor = pickle.load(open(os.path.join(models_dir, "best_model_price_regression_clean.pkl"), "rb"))
-        label_encoders = pickle.load(open(os.path.join(models_dir, "label_encoders.pkl"), "rb"))
-        scaler_deal = pickle.load(open(os.path.join(models_dir, "scaler_deal_classifier.pkl"), "rb"))
-        scaler_price = pickle.load(open(os.path.join(models_dir, "scaler_price_regression_clean.pkl"), "rb"))
-        regression_features = pickle.load(open(os.path.join(models_dir, "regression_features_clean.pkl"), "rb"))
+        deal_classifier = load_model_file(models_dir, "best_model_deal_classifier_Gradient_Boosting.pkl")
+        price_regressor = load_model_file(models_dir, "best_model_price_regression_clean.pkl")
+        label_encoders = load_model_file(models_dir, "label_encoders.pkl")
+        scaler_deal = load_model_file(models_dir, "scaler_deal_classifier.pkl")
+        scaler_price = load_model_file(models_dir, "scaler_price_regression_clean.pkl")
+        regression_features = load_model_file(models_dir, "regression_features_clean.pkl")
+
+        # {class: code} per encoder, so predictions skip LabelEncoder.transform.
+        encoder_maps = {
+            col: {c: i for i, c in enumerate(enc.classes_)}
+            for col, enc in label_encoders.items()
+        }
 
         return {
             "deal_classifier": deal_classifier,
             "price_regressor": price_regressor,
             "label_encoders": label_encoders,
+            "encoder_maps": encoder_maps,
             "scaler_deal": scaler_deal,
             "scaler_price": scaler_price,
             "regression_features": regression_features
@@ -226,83 +376,311 @@ def load_models():
 
 models = load_models()
 
-def prepare_features(row, models_dict):
+def original_prices(price_eur, discount_pct):
+    """Pre-discount prices; a 100% discount has no recoverable original, so the price is kept."""
+    return price_eur / np.where(discount_pct < 100, 1 - discount_pct / 100, 1.0)
+
+def prepare_features_batch(df, models_dict, discount_pct, original_price_eur):
     """
-    Prepare a single row of data for model prediction.
-    Returns two feature vectors: one for classification (9 features) and one for regression (8 features).
+    Prepare every row of df for model prediction in one pass, from precomputed discount and original-price arrays.
+    Returns two float64 matrices: one for classification (9 features) and one for regression (8 features).
     """
-    encoders = models_dict["label_encoders"]
-
-    discount_pct = float(row.get('discount_pct', 0))
-    original_price_eur = float(row.get('price_eur', 0)) / (1 - (discount_pct / 100)) if discount_pct < 100 else float(row.get('price_eur', 0))
-
-    if discount_pct == 0:
-        original_price_eur = float(row.get('price_eur', 0))
-
-    has_discount = 1 if discount_pct > 0 else 0
-    high_discount = 1 if discount_pct >= 50 else 0 
-
-    source = str(row.get('source_file', 'Unknown'))
-    platform = str(row.get('platform', 'Unknown'))
-    storefront = str(row.get('storefront', 'Unknown')) 
-    category = str(row.get('category', 'Unknown'))     
-    is_preorder = str(row.get('is_preorder', 'False')) 
+    encoder_maps = models_dict["encoder_maps"]
+    n = len(df)
+
+    # Labels are compared as strings, as the encoders were fit; unknown ones fall back to code 0.
+    cat_sources = {
+        'source': 'source_file',
+        'platform': 'platform',
+        'storefront': 'storefront',
+        'category': 'category',
+        'is_preorder': 'is_preorder',
+    }
 
-    encoded_cats = {}
-    cat_cols = ['source', 'platform', 'storefront', 'category', 'is_preorder']
+    # float64 like the per-row lists the scalers were fit on; float32 input makes
+    # StandardScaler compute in float32 and nudges rows across tree split thresholds.
+    X_reg = np.empty((n, 8), dtype=np.float64)
+    X_reg[:, 0] = discount_pct
+    X_reg[:, 1] = discount_pct > 0
+    X_reg[:, 2] = discount_pct >= 50
+    for j, (col, src) in enumerate(cat_sources.items(), start=3):
+        values = df[src]
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(object).map(str)
+        codes = values.map(encoder_maps.get(col, {}))
+        X_reg[:, j] = pd.to_numeric(codes, errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+
+    X_clf = np.empty((n, 9), dtype=np.float64)
+    X_clf[:, 0] = discount_pct
+    X_clf[:, 1] = original_price_eur
+    X_clf[:, 2:] = X_reg[:, 1:]
+
+    return X_clf, X_reg
+
+def frame_token(df):
+    """Cache key for the loaded frame; only pass the full frame from load_data."""
+    return df.attrs['load_token']
+
+# Per-filter-state cache for everything derived from the filtered view.
+view_cache = st.cache_data(show_spinner=False, max_entries=64, hash_funcs={pd.DataFrame: frame_token})
+
+@view_cache
+def score_deals(df, stores, lo, hi, min_discount, query, _models):
+    """Deal verdict, confidence, fair and original price for every filtered row, from one batched call per model."""
+    filtered, _ = compute_view(df, stores, lo, hi, min_discount, query)
+    discount_pct = filtered['discount_pct'].to_numpy(dtype=np.float64)
+    original_price_eur = original_prices(filtered['price_eur'].to_numpy(dtype=np.float64), discount_pct)
+    X_clf, X_reg = prepare_features_batch(filtered, _models, discount_pct, original_price_eur)
+
+    X_scaled_deal = _models["scaler_deal"].transform(X_clf)
+    clf = _models["deal_classifier"]
+    X_scaled_price = _models["scaler_price"].transform(X_reg)
+
+    # One pass through the binary ensemble: predict() thresholds the raw score at 0
+    # and predict_proba() is its sigmoid, so the winning class's probability is sigmoid(|raw|).
+    raw = clf.decision_function(X_scaled_deal)
+
+    return pd.DataFrame({
+        'deal_pred': clf.classes_[(raw >= 0).astype(int)],
+        'deal_conf': 1 / (1 + np.exp(-np.abs(raw))),
+        'predicted_price': _models["price_regressor"].predict(X_scaled_price),
+        'original_price': original_price_eur,
+    }, index=filtered.index)
+
+def apply_filters(df, stores, lo, hi, min_discount, query):
+    # Compare int8 category codes and raw arrays instead of going through Series ops.
+    store_codes = df.attrs['store_codes']
+    selected_codes = np.fromiter(
+        (store_codes[s] for s in stores if s in store_codes), dtype=np.int8
+    )
+    price = df['price_eur'].to_numpy()
+    mask = (
+        np.isin(df['source_file'].cat.codes.to_numpy(), selected_codes) &
+        (price >= lo) & (price <= hi) &
+        (df['discount_pct'].to_numpy() >= min_discount)
+    )
+    if query:
+        mask &= df['title_lower'].str.contains(query.lower(), regex=False, na=False).to_numpy(dtype=bool)
+    return df.loc[mask]
+
+def top_by_discount(df, k):
+    """The k highest-discount rows, sorted, without sorting the whole frame."""
+    if len(df) > k:
+        disc = df['discount_pct'].to_numpy()
+        df = df.iloc[np.argpartition(-disc, k - 1)[:k]]
+    return df.sort_values(by='discount_pct', ascending=False)
+
+@view_cache
+def compute_view(df, stores, lo, hi, min_discount, query):
+    """Filtered rows plus the metric and chart aggregates, cached per widget state."""
+    filtered = apply_filters(df, stores, lo, hi, min_discount, query)
+
+    # One pass over the rows; every metric and chart series comes from this small table.
+    agg = (
+        filtered.assign(great=filtered['discount_pct'] >= 50)
+        .groupby(['source_file', 'platform'], observed=True, dropna=False, sort=False)
+        .agg(
+            n=('price_eur', 'size'),
+            price_sum=('price_eur', 'sum'),
+            disc_sum=('discount_pct', 'sum'),
+            great=('great', 'sum'),
+        )
+    )
+    n = int(agg['n'].sum())
+
+    # Both are re-sorted by value below, so the group keys needn't be sorted.
+    store_counts = agg.groupby(level='source_file', observed=True, sort=False)['n'].sum()
+    by_platform = agg.groupby(level='platform', observed=True, sort=False)[['price_sum', 'n']].sum()
+    platform_stats = (
+        (by_platform['price_sum'] / by_platform['n']).rename('price_eur')
+        .reset_index().sort_values('price_eur', ascending=False)
+    )
+    titles = filtered['title'].drop_duplicates()
+    return filtered, {
+        'avg_price': agg['price_sum'].sum() / n if n else np.nan,
+        'avg_discount': agg['disc_sum'].sum() / n if n else np.nan,
+        'great_deals': int(agg['great'].sum()),
+        'store_counts': store_counts[store_counts > 0].sort_values(ascending=False),
+        'platform_stats': platform_stats,
+        # Title -> label of its first row, in first-seen order; also the selectbox options.
+        'game_rows': dict(zip(titles, titles.index)),
+        'table': top_by_discount(
+            filtered[['title', 'price_eur', 'discount_pct', 'source_file', 'platform', 'product_url']],
+            TABLE_ROW_LIMIT,
+        ),
+    }
 
-    for col in cat_cols:
-        val = locals()[col]
-        encoder = encoders.get(col)
-        if encoder:
-            try:
-                if val in encoder.classes_:
-                    encoded_cats[col] = encoder.transform([val])[0]
-                else:
-                    encoded_cats[col] = encoder.transform([encoder.classes_[0]])[0] 
-            except:
-                 encoded_cats[col] = 0
-        else:
-            encoded_cats[col] = 0
-
-    features_clf = [
-        discount_pct,
-        original_price_eur,
-        has_discount,
-        high_discount,
-        encoded_cats['source'],
-        encoded_cats['platform'],
-        encoded_cats['storefront'],
-        encoded_cats['category'],
-        encoded_cats['is_preorder']
-    ]
-
-    features_reg = [
-        discount_pct,
-        has_discount,
-        high_discount,
-        encoded_cats['source'],
-        encoded_cats['platform'],
-        encoded_cats['storefront'],
-        encoded_cats['category'],
-        encoded_cats['is_preorder']
-    ]
-
-    return np.array([features_clf]), np.array([features_reg])
+def box_stats(df):
+    """Per-store quartiles, whisker ends and outliers for the price box plot."""
+    stats = []
+    for store, prices in df.groupby('source_file', observed=True, sort=False)['price_eur']:
+        q1, median, q3 = prices.quantile([0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        inside = prices.between(q1 - 1.5 * iqr, q3 + 1.5 * iqr)
+        stats.append({
+            'store': store, 'q1': q1, 'median': median, 'q3': q3,
+            'lowerfence': prices[inside].min(), 'upperfence': prices[inside].max(),
+            'outliers': prices[~inside].to_numpy(),
+        })
+    return stats
+
+def discount_histogram(df):
+    """20 five-point bins of the non-zero discounts."""
+    return np.histogram(
+        df.loc[df['discount_pct'] > 0, 'discount_pct'].to_numpy(), bins=20, range=(0, 100)
+    )
+
+@view_cache
+def box_figure(df, stores, lo, hi, min_discount, query):
+    """Price box plot of the filtered view, as a plotly figure dict."""
+    filtered, _ = compute_view(df, stores, lo, hi, min_discount, query)
+    palette = px.colors.qualitative.Bold
+    fig_box = go.Figure()
+    for i, b in enumerate(box_stats(filtered)):
+        color = palette[i % len(palette)]
+        fig_box.add_trace(go.Box(
+            x=[b['store']], name=b['store'], q1=[b['q1']], median=[b['median']],
+            q3=[b['q3']], lowerfence=[b['lowerfence']], upperfence=[b['upperfence']],
+            line_color=color,
+        ))
+        if len(b['outliers']):
+            fig_box.add_trace(go.Scatter(
+                x=[b['store']] * len(b['outliers']), y=b['outliers'],
+                mode='markers', name=b['store'], hoverinfo='y',
+            ))
+    fig_box.update_layout(
+        xaxis_title="Store",
+        yaxis_title="Price (€)",
+        template="plotly_dark",
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        showlegend=False,
+        margin=dict(l=20, r=20, t=30, b=20),
+        font=dict(family="Inter", color="#E0E0E0")
+    )
+
+    fig_box.update_traces(marker=dict(color='#D500F9', opacity=0.7))
+    return fig_box.to_dict()
+
+@view_cache
+def discount_figure(df, stores, lo, hi, min_discount, query):
+    """Histogram of the filtered view's non-zero discounts, as a plotly figure dict."""
+    filtered, _ = compute_view(df, stores, lo, hi, min_discount, query)
+    counts, edges = discount_histogram(filtered)
+    fig_hist = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        marker_color='#D500F9',
+    ))
+    fig_hist.update_layout(
+        xaxis_title="Discount (%)",
+        yaxis_title="count",
+        template="plotly_dark",
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        bargap=0.1,
+        margin=dict(l=20, r=20, t=30, b=20),
+        font=dict(family="Inter", color="#E0E0E0")
+    )
+    return fig_hist.to_dict()
+
+@view_cache
+def scatter_figure(df, stores, lo, hi, min_discount, query):
+    """Price vs. discount scatter of the filtered view, as a plotly figure dict."""
+    filtered, _ = compute_view(df, stores, lo, hi, min_discount, query)
+    # One WebGL trace per store, fed plain NumPy arrays so plotly skips DataFrame introspection.
+    fig_scatter = go.Figure()
+    palette = px.colors.qualitative.Vivid
+    groups = filtered.groupby('source_file', observed=True, sort=False)
+    for i, (store, sub) in enumerate(groups):
+        if len(sub) > SCATTER_POINTS_PER_STORE:
+            sub = sub.sample(SCATTER_POINTS_PER_STORE, random_state=0)
+        fig_scatter.add_trace(go.Scattergl(
+            x=sub['price_eur'].to_numpy(),
+            y=sub['discount_pct'].to_numpy(),
+            customdata=sub['title'].to_numpy(dtype=object),
+            mode='markers',
+            name=store,
+            marker_color=palette[i % len(palette)],
+            hovertemplate="%{customdata}<br>Price (€)=%{x}<br>Discount (%)=%{y}<extra>" + store + "</extra>",
+        ))
+    fig_scatter.update_layout(
+        xaxis_title="Price (€)",
+        yaxis_title="Discount (%)",
+        legend_title_text="source_file",
+        template="plotly_dark",
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=20, r=20, t=30, b=20),
+        font=dict(family="Inter", color="#E0E0E0"),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    fig_scatter.update_traces(marker=dict(size=8, opacity=0.7, line=dict(width=1, color='white')))
+    return fig_scatter.to_dict()
+
+@view_cache
+def store_figure(df, stores, lo, hi, min_discount, query):
+    """Games-per-store donut of the filtered view, as a plotly figure dict."""
+    _, view = compute_view(df, stores, lo, hi, min_discount, query)
+    store_counts = view['store_counts'].reset_index()
+    store_counts.columns = ['Store', 'Count']
+
+    fig_donut = go.Figure(go.Pie(
+        labels=store_counts['Store'],
+        values=store_counts['Count'],
+        hole=0.5,
+        marker_colors=px.colors.qualitative.Pastel[:len(store_counts)]
+    ))
+    fig_donut.update_layout(
+        template="plotly_dark",
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=20, r=20, t=30, b=20),
+        font=dict(family="Inter", color="#E0E0E0"),
+        showlegend=True
+    )
+    fig_donut.update_traces(textposition='inside', textinfo='percent+label')
+    return fig_donut.to_dict()
+
+@view_cache
+def platform_figure(df, stores, lo, hi, min_discount, query):
+    """Average price per platform of the filtered view, as a plotly figure dict."""
+    _, view = compute_view(df, stores, lo, hi, min_discount, query)
+    platform_stats = view['platform_stats']
+    fig_bar = go.Figure(go.Bar(
+        x=platform_stats['platform'],
+        y=platform_stats['price_eur'],
+        marker=dict(
+            color=platform_stats['price_eur'],
+            colorscale='Purples',
+            showscale=True,
+            colorbar=dict(title='Avg Price (€)')
+        )
+    ))
+    fig_bar.update_layout(
+        xaxis_title='Platform',
+        yaxis_title='Avg Price (€)',
+        template="plotly_dark",
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=20, r=20, t=30, b=20),
+        font=dict(family="Inter", color="#E0E0E0")
+    )
+    return fig_bar.to_dict()
 
 with st.sidebar:
     st.markdown("### 🛠️ Filters")
 
     if not df.empty:
 
-        all_stores = sorted(df['source_file'].unique().tolist())
+        all_stores = sorted(df['source_file'].cat.categories)
         selected_stores = st.multiselect("Select Stores", all_stores, default=all_stores)
 
         st.markdown("---")
 
         st.markdown("#### Price Range (€)")
-        min_price_val = float(df['price_eur'].min())
-        max_price_val = float(df['price_eur'].max())
+        max_price_val = df.attrs['price_max']
 
         price_range = st.slider(
             "Select Price Range",
@@ -329,30 +707,20 @@ if df.empty:
     st.warning("⚠️ No data found. Please check your data directory.")
 else:
 
-    filtered_df = df[
-        (df['source_file'].isin(selected_stores)) &
-        (df['price_eur'] >= price_range[0]) &
-        (df['price_eur'] <= price_range[1]) &
-        (df['discount_pct'] >= min_discount)
-    ]
-
-    if search_query:
-        filtered_df = filtered_df[filtered_df['title'].str.contains(search_query, case=False, na=False)]
+    # Sorted so the same store selection hits the same cache entry in any click order.
+    view_args = (df, tuple(sorted(selected_stores)), price_range[0], price_range[1], min_discount, search_query)
+    filtered_df, view = compute_view(*view_args)
 
     m1, m2, m3, m4 = st.columns(4)
 
     with m1:
         st.metric("Total Games", f"{len(filtered_df):,}")
     with m2:
-        avg_price = filtered_df['price_eur'].mean()
-        st.metric("Avg Price", f"€{avg_price:.2f}")
+        st.metric("Avg Price", f"€{view['avg_price']:.2f}")
     with m3:
-        avg_discount = filtered_df['discount_pct'].mean()
-        st.metric("Avg Discount", f"{avg_discount:.1f}%")
+        st.metric("Avg Discount", f"{view['avg_discount']:.1f}%")
     with m4:
-
-        great_deals = len(filtered_df[filtered_df['discount_pct'] >= 50])
-        st.metric("Great Deals (50%+)", f"{great_deals:,}")
+        st.metric("Great Deals (50%+)", f"{view['great_deals']:,}")
 
     st.markdown('<div class="ai-box">', unsafe_allow_html=True)
     st.subheader("🤖 AI Deal Predictor")
@@ -362,8 +730,7 @@ else:
 
     with col_ai_1:
 
-        game_options = filtered_df['title'].unique().tolist()
-        selected_game_title = st.selectbox("Select Game to Analyze", game_options)
+        selected_game_title = st.selectbox("Select Game to Analyze", tuple(view['game_rows']))
 
     with col_ai_2:
         st.write("") 
@@ -372,33 +739,24 @@ else:
 
     if analyze_btn and selected_game_title and models:
 
-        game_row = filtered_df[filtered_df['title'] == selected_game_title].iloc[0]
+        game_row = filtered_df.loc[view['game_rows'][selected_game_title]]
 
-        X_clf, X_reg = prepare_features(game_row, models)
+        # Scored once per filter state; picking another game reuses the cached batch.
+        scores = score_deals(*view_args, models).loc[game_row.name]
 
         discount_pct = float(game_row.get('discount_pct', 0))
         current_price = float(game_row.get('price_eur', 0))
-        if discount_pct > 0 and discount_pct < 100:
-             original_price = current_price / (1 - (discount_pct / 100))
-        else:
-             original_price = current_price
+        original_price = scores['original_price']
 
         savings = original_price - current_price
 
-        scaler_deal = models["scaler_deal"]
-        clf = models["deal_classifier"]
-        X_scaled_deal = scaler_deal.transform(X_clf)
-        deal_pred = clf.predict(X_scaled_deal)[0] 
-        deal_prob = clf.predict_proba(X_scaled_deal)[0]
-
-        scaler_price = models["scaler_price"]
-        reg = models["price_regressor"]
-        X_scaled_price = scaler_price.transform(X_reg)
-        predicted_price = reg.predict(X_scaled_price)[0]
+        deal_pred = scores['deal_pred']
+        deal_conf = scores['deal_conf']
+        predicted_price = scores['predicted_price']
 
         if discount_pct >= 25 or savings >= 10:
             deal_pred = "Good Deal"
-            deal_prob = [1.0] 
+            deal_conf = 1.0
 
         st.markdown("---")
 
@@ -410,10 +768,10 @@ else:
             st.markdown("#### AI Verdict")
             if deal_pred == "Good Deal":
                 st.markdown(f'<p class="prediction-good">✅ GOOD DEAL</p>', unsafe_allow_html=True)
-                st.caption(f"Confidence: {max(deal_prob)*100:.1f}%")
+                st.caption(f"Confidence: {deal_conf*100:.1f}%")
             else:
                 st.markdown(f'<p class="prediction-bad">❌ NOT A DEAL</p>', unsafe_allow_html=True)
-                st.caption(f"Confidence: {max(deal_prob)*100:.1f}%")
+                st.caption(f"Confidence: {deal_conf*100:.1f}%")
 
         with res_col2:
             st.markdown("#### Price Analysis")
@@ -434,128 +792,47 @@ else:
     with col_charts_1:
         st.subheader("📊 Price Distribution by Store")
         if not filtered_df.empty:
-            fig_box = px.box(
-                filtered_df, 
-                x="source_file", 
-                y="price_eur", 
-                color="source_file",
-                color_discrete_sequence=px.colors.qualitative.Bold, 
-                labels={"price_eur": "Price (€)", "source_file": "Store"}
-            )
-            fig_box.update_layout(
-                template="plotly_dark",
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                showlegend=False,
-                margin=dict(l=20, r=20, t=30, b=20),
-                font=dict(family="Inter", color="#E0E0E0")
-            )
-
-            fig_box.update_traces(marker=dict(color='#D500F9', opacity=0.7))
-            st.plotly_chart(fig_box, use_container_width=True)
+            st.plotly_chart(box_figure(*view_args), use_container_width=True)
         else:
             st.info("No data for visualization.")
 
     with col_charts_2:
         st.subheader("🔥 Top Discounts")
         if not filtered_df.empty:
-
-            fig_hist = px.histogram(
-                filtered_df[filtered_df['discount_pct'] > 0],
-                x="discount_pct",
-                nbins=20,
-                color_discrete_sequence=['#D500F9'],
-                labels={"discount_pct": "Discount (%)"}
-            )
-            fig_hist.update_layout(
-                template="plotly_dark",
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                bargap=0.1,
-                margin=dict(l=20, r=20, t=30, b=20),
-                font=dict(family="Inter", color="#E0E0E0")
-            )
-            st.plotly_chart(fig_hist, use_container_width=True)
+            st.plotly_chart(discount_figure(*view_args), use_container_width=True)
         else:
             st.info("No discounts found.")
 
-    col_charts_3, col_charts_4 = st.columns(2)
+    # Off-screen by default; with on_change="rerun" the body only runs while the expander is open.
+    deeper = st.expander("📊 Deeper analytics", key="deeper_analytics", on_change="rerun")
+    with deeper:
+        if deeper.open:
+            col_charts_3, col_charts_4 = st.columns(2)
 
-    with col_charts_3:
-        st.subheader("💎 Deal Hunter: Price vs. Discount")
-        if not filtered_df.empty:
-            fig_scatter = px.scatter(
-                filtered_df,
-                x="price_eur",
-                y="discount_pct",
-                color="source_file",
-                hover_data=['title'],
-                labels={"price_eur": "Price (€)", "discount_pct": "Discount (%)"},
-                color_discrete_sequence=px.colors.qualitative.Vivid
-            )
-            fig_scatter.update_layout(
-                template="plotly_dark",
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                margin=dict(l=20, r=20, t=30, b=20),
-                font=dict(family="Inter", color="#E0E0E0"),
-                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-            )
-            fig_scatter.update_traces(marker=dict(size=8, opacity=0.7, line=dict(width=1, color='white')))
-            st.plotly_chart(fig_scatter, use_container_width=True)
-
-    with col_charts_4:
-        st.subheader("🍩 Games by Store")
-        if not filtered_df.empty:
-            store_counts = filtered_df['source_file'].value_counts().reset_index()
-            store_counts.columns = ['Store', 'Count']
-
-            fig_donut = px.pie(
-                store_counts,
-                values='Count',
-                names='Store',
-                hole=0.5,
-                color_discrete_sequence=px.colors.qualitative.Pastel
-            )
-            fig_donut.update_layout(
-                template="plotly_dark",
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                margin=dict(l=20, r=20, t=30, b=20),
-                font=dict(family="Inter", color="#E0E0E0"),
-                showlegend=True
-            )
-            fig_donut.update_traces(textposition='inside', textinfo='percent+label')
-            st.plotly_chart(fig_donut, use_container_width=True)
-
-    st.subheader("🎮 Average Price by Platform")
-    if not filtered_df.empty and 'platform' in filtered_df.columns:
+            with col_charts_3:
+                st.subheader("💎 Deal Hunter: Price vs. Discount")
+                if not filtered_df.empty:
+                    st.plotly_chart(scatter_figure(*view_args), use_container_width=True)
+                    if (view['store_counts'] > SCATTER_POINTS_PER_STORE).any():
+                        st.caption(f"Showing up to {SCATTER_POINTS_PER_STORE:,} sampled games per store.")
 
-        platform_stats = filtered_df.groupby('platform')['price_eur'].mean().reset_index().sort_values('price_eur', ascending=False)
+            with col_charts_4:
+                st.subheader("🍩 Games by Store")
+                if not filtered_df.empty:
+                    st.plotly_chart(store_figure(*view_args), use_container_width=True)
 
-        fig_bar = px.bar(
-            platform_stats,
-            x='platform',
-            y='price_eur',
-            color='price_eur',
-            color_continuous_scale='Purples',
-            labels={'price_eur': 'Avg Price (€)', 'platform': 'Platform'}
-        )
-        fig_bar.update_layout(
-            template="plotly_dark",
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            margin=dict(l=20, r=20, t=30, b=20),
-            font=dict(family="Inter", color="#E0E0E0")
-        )
-        st.plotly_chart(fig_bar, use_container_width=True)
+            st.subheader("🎮 Average Price by Platform")
+            if not filtered_df.empty and 'platform' in filtered_df.columns:
+                st.plotly_chart(platform_figure(*view_args), use_container_width=True)
 
     st.subheader("📋 Game List")
 
     if not filtered_df.empty:
 
+        if len(filtered_df) > TABLE_ROW_LIMIT:
+            st.caption(f"Showing the top {TABLE_ROW_LIMIT:,} of {len(filtered_df):,} games by discount.")
         st.dataframe(
-            filtered_df[['title', 'price_eur', 'discount_pct', 'source_file', 'platform', 'product_url']].sort_values(by='discount_pct', ascending=False),
+            view['table'],
             column_config={
                 "title": "Game Title",
                 "price_eur": st.column_config.NumberColumn(
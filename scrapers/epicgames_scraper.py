@@ -1,69 +1,284 @@
 import time
 import csv
+import queue
 import random
+import weakref
+from contextlib import contextmanager
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin
 
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
 import undetected_chromedriver as uc
+from selenium.common.exceptions import StaleElementReferenceException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
 
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
+)
+
+CARD_SELECTOR = "div[data-component='BrowseOfferCard']"
+
+# Every (By, selector) locator the scraper waits on or clicks, built once.
+SELECTORS = {
+    "main": (By.CSS_SELECTOR, "main"),
+    "card": (By.CSS_SELECTOR, CARD_SELECTOR),
+    "age_gate": (By.CSS_SELECTOR, "div[data-testid='AgeSelect'], div[data-testid='age-gate-wrapper']"),
+    "age_menu_item": (
+        By.CSS_SELECTOR,
+        "div[data-popper-placement] ul[role='menu'] li button[data-testid='MenuItemButton']",
+    ),
+    "age_year": (By.CSS_SELECTOR, "button#year_toggle"),
+    "age_month": (By.CSS_SELECTOR, "button#month_toggle"),
+    "age_day": (By.CSS_SELECTOR, "button#day_toggle"),
+    "age_continue": (By.ID, "btn_age_continue"),
+    "age_continue_text": (By.XPATH, "//button[span[text()='Continue']]"),
+}
+
+# Page elements usually show up well under WebDriverWait's default 0.5s poll.
+WAIT_POLL = 0.1
+
+# Only DOM text is read, so heavy assets the page never needs are not downloaded.
+# Stylesheets still load: innerText and the age gate's clickability depend on layout.
+BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm",
+]
+
+# Page threads per pooled driver. A thread spends most of its time fetching a
+# listing or waiting for a free driver, so extra threads have listings ready
+# by the time a driver frees up.
+PAGE_WORKERS_PER_DRIVER = 4
+
+# Detail pages opened at once per driver; their loads overlap while each is read in turn.
+DETAIL_TABS = 4
+
+# Each harvest runs in the page as one execute_script call instead of a WebDriver
+# round-trip per field. xpath() mirrors Selenium's By.XPATH lookups.
+HARVEST_HELPERS = """
+const text = el => el ? (el.innerText || "").trim() : "";
+const xpath = (path, root) => document.evaluate(
+    path, root || document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+).singleNodeValue;
+const all = (sel, root) => Array.from((root || document).querySelectorAll(sel));
+"""
+
+DETAIL_JS = HARVEST_HELPERS + """
+const title = document.querySelector("span[data-testid='pdp-title']");
+const release = xpath("//span[normalize-space()='Initial Release']/following::time[1]")
+    || xpath("//span[normalize-space()='Release Date']/following::time[1]");
+return {
+    title: title ? text(title) : null,
+    description: text(document.querySelector("div.css-1myreog")),
+    tags: all("a[href*='/en-US/browse?tag=']").map(text).filter(Boolean),
+    platforms: all("li[data-testid^='metadata-platform-']").map(text).filter(Boolean),
+    developer: text(document.querySelector("span[data-testid='metadata-developer-single']")),
+    publisher: text(xpath("//span[normalize-space()='Publisher']/following::span[1]")),
+    release_date: text(release),
+    age: text(document.querySelector("div[data-testid='ratings-title'] strong")),
+    descriptions: all("div[data-testid='ratings-descriptions'] span").map(text),
+    system_requirements: text(document.querySelector("div[data-component='SystemRequirements']")),
+};
+"""
+
+LISTING_JS = HARVEST_HELPERS + """
+return all(arguments[0]).map(card => {
+    const link = card.querySelector("a[href*='/en-US/']");
+    if (!link) return null;
+    const prices = document.evaluate(
+        ".//span[contains(text(),'$')]", card, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+    );
+    const firstPrice = prices.snapshotLength ? text(prices.snapshotItem(0)) : "";
+    const full = xpath(".//strong[contains(text(),'$')]", card);
+    return {
+        url: link.href,
+        title: text(card),
+        discount_percent: text(xpath(".//span[contains(text(),'%')]", card)),
+        discount_price: firstPrice,
+        full_price: full ? text(full) : firstPrice,
+    };
+}).filter(Boolean);
+"""
+
+# One keep-alive session for every listing fetch.
+session = requests.Session()
+session.headers.update({
+    "User-Agent": USER_AGENT,
+    "Accept-Language": "en-US,en;q=0.9",
+})
+
+# Cookies the age gate set the first time it was solved. Every pooled driver gets
+# them before its next page, so later detail pages open without the gate.
+age_cookies = []
+
+def page_wait(driver, timeout):
+    """WebDriverWait that polls every WAIT_POLL seconds and rides out re-renders."""
+    return WebDriverWait(
+        driver, timeout,
+        poll_frequency=WAIT_POLL,
+        ignored_exceptions=(StaleElementReferenceException,),
+    )
+
 def human_delay(a=1.5, b=3.5):
     time.sleep(random.uniform(a, b))
 
+# One ActionChains per driver; entries go away with their driver.
+_action_chains = weakref.WeakKeyDictionary()
+
 def human_mouse_move(driver):
     try:
-        actions = ActionChains(driver)
+        actions = _action_chains.get(driver)
+        if actions is None:
+            actions = _action_chains[driver] = ActionChains(driver)
         actions.move_by_offset(random.randint(20, 80), random.randint(20, 80)).perform()
         actions.move_by_offset(-random.randint(20, 80), random.randint(20, 80)).perform()
     except:
         pass
 
-def init_driver():
+def init_driver(headless=False):
     options = uc.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
     options.add_argument("--disable-gpu")
     options.add_argument("--window-size=1920,1080")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
 
-    options.add_argument(
-        "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
-    )
+    options.add_argument(f"user-agent={USER_AGENT}")
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
 
     driver = uc.Chrome(options=options)
+    block_assets(driver)
     return driver
 
+def block_assets(driver):
+    """Block BLOCKED_URLS in the current tab; each CDP tab needs its own call."""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+    except Exception as e:
+        print("[DRIVER] Could not block assets:", e)
+
+def open_detail_tab(driver, url, main):
+    """
+    Open url in a new CDP tab with its assets blocked before it starts loading.
+    Page.navigate returns without waiting for the load, and switching back to
+    main keeps chromedriver from waiting on it before the next tab opens.
+    """
+    tab = driver.execute_cdp_cmd("Target.createTarget", {"url": "about:blank"})["targetId"]
+    try:
+        driver.switch_to.window(tab)
+        block_assets(driver)
+        driver.execute_cdp_cmd("Page.navigate", {"url": url})
+    except Exception:
+        driver.execute_cdp_cmd("Target.closeTarget", {"targetId": tab})
+        raise
+    finally:
+        driver.switch_to.window(main)
+    return tab
+
+def apply_age_cookies(driver):
+    """Install the saved age-gate cookies through CDP, which works from any page."""
+    if not age_cookies:
+        return
+    cookies = []
+    for c in age_cookies:
+        param = {
+            k: c[k]
+            for k in ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite")
+            if k in c
+        }
+        if "expiry" in c:
+            param["expires"] = c["expiry"]
+        cookies.append(param)
+    try:
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+    except Exception as e:
+        print("[AGE-GATE] Could not apply cookies:", e)
+
+class DriverPool:
+    """
+    A fixed set of Chrome drivers shared by the page workers, so Chrome
+    starts once per worker instead of once per page.
+    """
+
+    def __init__(self, size, headless=False):
+        self._headless = headless
+        self._idle = queue.Queue()
+        for _ in range(size):
+            self._idle.put(init_driver(headless))
+
+    @contextmanager
+    def driver(self):
+        drv = self._idle.get()
+        apply_age_cookies(drv)
+        try:
+            yield drv
+        finally:
+            self._idle.put(self._reset(drv))
+
+    def _reset(self, drv):
+        """
+        Blank the page and cookies before the next page; replace a driver that died.
+        driver() puts the age-gate cookies back when the driver is next taken.
+        """
+        try:
+            # delete_all_cookies() only reaches the current page's domain, so the
+            # whole browser's jar is cleared through CDP instead.
+            drv.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            drv.get("about:blank")
+            return drv
+        except Exception as e:
+            print("[POOL] Restarting driver:", e)
+            try:
+                drv.quit()
+            except:
+                pass
+            return init_driver(self._headless)
+
+    def close(self):
+        while not self._idle.empty():
+            try:
+                self._idle.get_nowait().quit()
+            except:
+                pass
+
 def handle_age_verification(driver):
     """
     Epic Games Age Gate Handler (Fixed for popper-based dropdown menus)
     """
 
-    time.sleep(1)
+    # Once the gate's cookies are known it should not appear, so don't wait for it.
+    if not age_cookies:
+        time.sleep(1)
 
     try:
-        popup = driver.find_elements(By.CSS_SELECTOR, "div[data-testid='AgeSelect'], div[data-testid='age-gate-wrapper']")
+        popup = driver.find_elements(*SELECTORS["age_gate"])
         if not popup:
             return
         print("[AGE-GATE] Detected popup, solving...")
 
-        wait = WebDriverWait(driver, 10)
+        before = {(c["name"], c["value"]) for c in driver.get_cookies()}
+
+        wait = page_wait(driver, 10)
 
-        def select_from_dropdown(toggle_selector, desired_text):
+        def select_from_dropdown(toggle_locator, desired_text):
             """
-            toggle_selector = css for the dropdown toggle button
+            toggle_locator = SELECTORS entry for the dropdown toggle button
             desired_text = '1990', '01', '12', etc.
             """
 
-            toggle = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, toggle_selector)))
+            toggle = wait.until(EC.element_to_be_clickable(toggle_locator))
             toggle.click()
             time.sleep(0.6)
 
-            menu_items = wait.until(EC.presence_of_all_elements_located((
-                By.CSS_SELECTOR,
-                "div[data-popper-placement] ul[role='menu'] li button[data-testid='MenuItemButton']"
-            )))
+            menu_items = wait.until(EC.presence_of_all_elements_located(SELECTORS["age_menu_item"]))
 
             for item in menu_items:
                 if item.text.strip() == desired_text:
@@ -74,38 +289,44 @@ def handle_age_verification(driver):
             print(f"[AGE-GATE] Could not find: {desired_text}")
             return False
 
-        select_from_dropdown("button#year_toggle", "1990")
+        select_from_dropdown(SELECTORS["age_year"], "1990")
 
-        select_from_dropdown("button#month_toggle", "01")
+        select_from_dropdown(SELECTORS["age_month"], "01")
 
-        select_from_dropdown("button#day_toggle", "01")
+        select_from_dropdown(SELECTORS["age_day"], "01")
 
         time.sleep(0.4)
 
         try:
-            btn = wait.until(EC.element_to_be_clickable((By.ID, "btn_age_continue")))
+            btn = wait.until(EC.element_to_be_clickable(SELECTORS["age_continue"]))
             driver.execute_script("arguments[0].removeAttribute('disabled');", btn)
             btn.click()
             print("[AGE-GATE] Continue clicked successfully")
         except:
             print("[AGE-GATE] Could not click Continue — trying fallback")
             try:
-                driver.find_element(By.XPATH, "//button[span[text()='Continue']]").click()
+                driver.find_element(*SELECTORS["age_continue_text"]).click()
             except:
                 print("[AGE-GATE] Continue button failed")
 
         time.sleep(1)
         print("[AGE-GATE] Done ✔")
 
+        if not age_cookies:
+            age_cookies[:] = [
+                c for c in driver.get_cookies() if (c["name"], c["value"]) not in before
+            ]
+            print(f"[AGE-GATE] Saved {len(age_cookies)} cookies for the other pages")
+
     except Exception as e:
         print(f"[AGE-GATE ERROR] {e}")
 
 def scrape_game_detail_page(driver, base):
     game = base.copy()
-    wait = WebDriverWait(driver, 20)
+    wait = page_wait(driver, 20)
 
     try:
-        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "main")))
+        wait.until(EC.presence_of_element_located(SELECTORS["main"]))
     except:
         return game
 
@@ -113,208 +334,189 @@ def scrape_game_detail_page(driver, base):
     human_mouse_move(driver)
 
     try:
-        game["title"] = driver.find_element(
-            By.CSS_SELECTOR, "span[data-testid='pdp-title']"
-        ).text.strip()
-    except:
-        game["title"] = game.get("title", "")
+        data = driver.execute_script(DETAIL_JS)
+    except Exception as e:
+        print("[ERROR] harvest:", e)
+        return game
 
-    try:
-        game["description"] = driver.find_element(
-            By.CSS_SELECTOR, "div.css-1myreog"
-        ).text.strip()
-    except:
-        game["description"] = ""
+    if data["title"] is not None:
+        game["title"] = data["title"]
+    game["description"] = data["description"]
 
-    try:
-        tag_links = driver.find_elements(By.XPATH, "//a[contains(@href, '/en-US/browse?tag=')]")
-        tag_texts = [t.text.strip() for t in tag_links if t.text.strip()]
-        joined = "|".join(tag_texts)
-        game["genres"] = joined
-        game["tags"] = joined
-    except:
-        game["genres"] = ""
-        game["tags"] = ""
+    joined = "|".join(data["tags"])
+    game["genres"] = joined
+    game["tags"] = joined
+    game["platforms"] = "|".join(data["platforms"])
 
-    try:
-        plat_items = driver.find_elements(By.CSS_SELECTOR, "li[data-testid^='metadata-platform-']")
-        plats = [p.text.strip() for p in plat_items if p.text.strip()]
-        game["platforms"] = "|".join(plats)
-    except:
-        game["platforms"] = ""
+    game["developer"] = data["developer"]
+    game["publisher"] = data["publisher"]
+    game["release_date"] = data["release_date"]
 
-    try:
-        game["developer"] = driver.find_element(
-            By.CSS_SELECTOR, "span[data-testid='metadata-developer-single']"
-        ).text.strip()
-    except:
-        game["developer"] = ""
+    age = data["age"]
+    descs = data["descriptions"]
+    if descs:
+        game["rating"] = f"{age} ({'; '.join(descs)})" if age else "; ".join(descs)
+    else:
+        game["rating"] = age
 
-    try:
-        pub_span = driver.find_element(
-            By.XPATH, "//span[normalize-space()='Publisher']/following::span[1]"
-        )
-        game["publisher"] = pub_span.text.strip()
-    except:
-        game["publisher"] = ""
+    game["system_requirements"] = data["system_requirements"]
+
+    return game
 
+def to_numeric(v):
+    if not v:
+        return ""
+    if v.lower() == "free":
+        return "Free"
+    clean = v.replace("$", "").replace(",", "")
     try:
-        time_elem = driver.find_element(
-            By.XPATH, "//span[normalize-space()='Initial Release']/following::time[1]"
-        )
-        game["release_date"] = time_elem.text.strip()
+        return float(clean)
     except:
-        try:
-            time_elem = driver.find_element(
-                By.XPATH, "//span[normalize-space()='Release Date']/following::time[1]"
-            )
-            game["release_date"] = time_elem.text.strip()
-        except:
-            game["release_date"] = ""
+        return ""
 
+def finish_listing_entry(g):
+    g["is_discounted"] = "yes" if g["discount_percent"] else "no"
+    g["full_price"] = to_numeric(g["full_price"])
+    g["discount_price"] = to_numeric(g["discount_price"])
+    return g
+
+def own_text(el):
+    """Text directly inside el, like XPath's text() (ignores nested tags)."""
+    return "".join(el.find_all(string=True, recursive=False)).strip()
+
+def fetch_listing(page_url):
+    """
+    Read the browse page's cards straight from the server-rendered HTML.
+    Returns None when the page needs a browser (blocked or client-rendered).
+    """
     try:
-        age = ""
-        descs = []
+        resp = session.get(page_url, timeout=20)
+    except requests.RequestException as e:
+        print(f"[HTTP] {page_url}: {e}")
+        return None
+    if resp.status_code != 200:
+        print(f"[HTTP] {page_url}: status {resp.status_code}")
+        return None
+
+    soup = BeautifulSoup(resp.text, "html.parser")
+    cards = soup.select(CARD_SELECTOR)
+    if not cards:
+        return None
+    print(f"[INFO] {len(cards)} cards (HTTP)")
 
-        try:
-            age = driver.find_element(
-                By.CSS_SELECTOR, "div[data-testid='ratings-title'] strong"
-            ).text.strip()
-        except:
-            pass
+    listing = []
+    for card in cards:
+        link = card.select_one("a[href*='/en-US/']")
+        if link is None or not link.get("href"):
+            continue
 
-        try:
-            desc_spans = driver.find_elements(
-                By.CSS_SELECTOR, "div[data-testid='ratings-descriptions'] span"
-            )
-            descs = [d.text.strip() for d in desc_spans]
-        except:
-            pass
-
-        if age or descs:
-            if descs:
-                game["rating"] = f"{age} ({'; '.join(descs)})" if age else "; ".join(descs)
-            else:
-                game["rating"] = age
-        else:
-            game["rating"] = ""
-    except:
-        game["rating"] = ""
+        g = {"url": urljoin(page_url, link["href"]), "title": card.get_text("\n", strip=True)}
 
-    try:
-        req_block = driver.find_element(By.CSS_SELECTOR, "div[data-component='SystemRequirements']")
-        game["system_requirements"] = req_block.text.strip()
-    except:
-        game["system_requirements"] = ""
+        disc = next((sp for sp in card.find_all("span") if "%" in own_text(sp)), None)
+        g["discount_percent"] = own_text(disc) if disc else ""
 
-    return game
+        price_spans = [sp for sp in card.find_all("span") if "$" in own_text(sp)]
+        g["discount_price"] = own_text(price_spans[0]) if price_spans else ""
 
-def scrape_page(page_url):
-    driver = init_driver()
-    print(f"[PAGE] {page_url}")
+        full = next((st for st in card.find_all("strong") if "$" in own_text(st)), None)
+        g["full_price"] = own_text(full) if full else g["discount_price"]
 
+        listing.append(finish_listing_entry(g))
+
+    return listing
+
+def listing_from_driver(driver, page_url):
+    """Fallback: load the browse page in Chrome and read its cards."""
     driver.get(page_url)
     human_delay()
     human_mouse_move(driver)
 
-    wait = WebDriverWait(driver, 25)
+    wait = page_wait(driver, 25)
 
     try:
-        wait.until(EC.presence_of_all_elements_located(
-            (By.CSS_SELECTOR, "div[data-component='BrowseOfferCard']")
-        ))
+        wait.until(EC.presence_of_all_elements_located(SELECTORS["card"]))
     except:
         print("[ERROR] No game cards found")
-        driver.quit()
         return []
 
-    cards = driver.find_elements(By.CSS_SELECTOR, "div[data-component='BrowseOfferCard']")
+    cards = driver.execute_script(LISTING_JS, CARD_SELECTOR)
     print(f"[INFO] {len(cards)} cards")
 
-    listing = []
-
-    for card in cards:
-        g = {}
-
-        try:
-            link = card.find_element(By.CSS_SELECTOR, "a[href*='/en-US/']")
-            g["url"] = link.get_attribute("href")
-        except:
-            continue
+    listing = [finish_listing_entry(g) for g in cards]
 
-        try:
-            g["title"] = card.text.strip()
-        except:
-            g["title"] = ""
+    return listing
 
-        try:
-            disc_elem = card.find_element(By.XPATH, ".//span[contains(text(),'%')]")
-            g["discount_percent"] = disc_elem.text.strip()
-        except:
-            g["discount_percent"] = ""
-
-        try:
-            price_spans = card.find_elements(By.XPATH, ".//span[contains(text(),'$')]")
-        except:
-            price_spans = []
+def scrape_details(driver, listing):
+    """
+    Visit the listing's detail pages DETAIL_TABS at a time: open one tab per game
+    through CDP so the loads run side by side, then read and close each tab.
+    """
+    results = []
+    main = driver.current_window_handle
 
-        if price_spans:
-            g["discount_price"] = price_spans[0].text.strip()
-        else:
-            g["discount_price"] = ""
+    for start in range(0, len(listing), DETAIL_TABS):
+        batch = listing[start:start + DETAIL_TABS]
 
-        try:
-            full_elem = card.find_element(By.XPATH, ".//strong[contains(text(),'$')]")
-            g["full_price"] = full_elem.text.strip()
-        except:
+        tabs = []
+        for g in batch:
             try:
-                g["full_price"] = price_spans[0].text.strip() if price_spans else ""
-            except:
-                g["full_price"] = ""
-
-        g["is_discounted"] = "yes" if g["discount_percent"] else "no"
+                tabs.append(open_detail_tab(driver, g["url"], main))
+            except Exception as e:
+                print("[ERROR] tab:", e)
+                tabs.append(None)
 
-        def to_numeric(v):
-            if not v:
-                return ""
-            if v.lower() == "free":
-                return "Free"
-            clean = v.replace("$", "").replace(",", "")
+        for g, tab in zip(batch, tabs):
+            if tab is None:
+                results.append(g)
+                continue
             try:
-                return float(clean)
-            except:
-                return ""
+                driver.switch_to.window(tab)
+                human_delay()
+                handle_age_verification(driver)
+                full = scrape_game_detail_page(driver, g)
+                results.append(full)
+            except Exception as e:
+                print("[ERROR] detail:", e)
+                results.append(g)
+            finally:
+                try:
+                    driver.execute_cdp_cmd("Target.closeTarget", {"targetId": tab})
+                except:
+                    pass
 
-        g["full_price"] = to_numeric(g["full_price"])
-        g["discount_price"] = to_numeric(g["discount_price"])
+        driver.switch_to.window(main)
 
-        listing.append(g)
+    return results
 
-    results = []
+def scrape_page(page_url, pool):
+    print(f"[PAGE] {page_url}")
 
-    for g in listing:
-        try:
-            driver.get(g["url"])
-            human_delay()
-            handle_age_verification(driver)
-            full = scrape_game_detail_page(driver, g)
-            results.append(full)
-        except Exception as e:
-            print("[ERROR] detail:", e)
-            results.append(g)
+    # A pooled driver is only taken for detail pages, or when the listing needs it.
+    listing = fetch_listing(page_url)
+    if listing == []:
+        return []
 
-    driver.quit()
-    return results
+    with pool.driver() as driver:
+        if listing is None:
+            listing = listing_from_driver(driver, page_url)
+        return scrape_details(driver, listing)
 
-def scrape_all_pages(page_urls, max_workers=2):
+def scrape_all_pages(page_urls, max_workers=2, headless=False):
     all_games = []
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(scrape_page, url): url for url in page_urls}
-        for future in as_completed(futures):
-            try:
-                all_games.extend(future.result())
-            except Exception as e:
-                print("[THREAD ERROR]", e)
+    page_workers = max_workers * PAGE_WORKERS_PER_DRIVER
+    # One kept-alive connection per page thread; requests' default keeps only 10.
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=page_workers))
+    pool = DriverPool(max_workers, headless)
+    try:
+        with ThreadPoolExecutor(max_workers=page_workers) as executor:
+            futures = {executor.submit(scrape_page, url, pool): url for url in page_urls}
+            for future in as_completed(futures):
+                try:
+                    all_games.extend(future.result())
+                except Exception as e:
+                    print("[THREAD ERROR]", e)
+    finally:
+        pool.close()
     return all_games
 
 def save_to_csv(data, filename="epic_games_full.csv"):
@@ -340,7 +542,8 @@ def main():
 
     parser = argparse.ArgumentParser(description="Epic Games Scraper")
     parser.add_argument("--limit", type=int, default=1000, help="Maximum number of items to scrape")
-    parser.add_argument("--max-workers", type=int, default=2, help="Number of worker threads")
+    parser.add_argument("--max-workers", type=int, default=2, help="Number of Chrome drivers to run in parallel")
+    parser.add_argument("--headless", action="store_true", help="Run Chrome without a window (more likely to be flagged as a bot)")
     args = parser.parse_args()
 
     num_pages = (args.limit + 39) // 40
@@ -355,7 +558,7 @@ def main():
         for p in range(1, num_pages + 1)
     ]
 
-    all_data = scrape_all_pages(page_urls, max_workers=args.max_workers)
+    all_data = scrape_all_pages(page_urls, max_workers=args.max_workers, headless=args.headless)
 
     if len(all_data) > args.limit:
         all_data = all_data[:args.limit]
@@ -0,0 +1,29 @@
+"""
+Convert the cleaned CSVs to Parquet once, so the dashboard reads typed columns
+instead of re-parsing text. Re-running the cleaners with --parquet does the same.
+"""
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+CLEANED_DIR = Path("data/cleaned")
+
+# Prices carry at most cents and discounts are whole percents.
+COLUMN_TYPES = {
+    "price_eur": pa.float32(),
+    "price_usd": pa.float32(),
+    "original_price_eur": pa.float32(),
+    "original_price_usd": pa.float32(),
+    "price": pa.float32(),
+    "discount_pct": pa.float32(),
+}
+
+for csv_path in sorted(CLEANED_DIR.glob("cleaned_*.csv")):
+    table = pacsv.read_csv(
+        csv_path, convert_options=pacsv.ConvertOptions(column_types=COLUMN_TYPES)
+    )
+    parquet_path = csv_path.with_suffix(".parquet")
+    pq.write_table(table, parquet_path, compression="zstd")
+    print(f"✅ {csv_path.name} -> {parquet_path.name} ({table.num_rows} rows)")
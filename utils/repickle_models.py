@@ -0,0 +1,17 @@
+"""
+Re-dump the trained model pickles with joblib, once, so the dashboard can
+memory-map their NumPy arrays instead of copying them into RAM on load.
+"""
+import pickle
+from pathlib import Path
+
+import joblib
+
+MODELS_DIR = Path("models")
+
+for pkl_path in sorted(MODELS_DIR.glob("*.pkl")):
+    with open(pkl_path, "rb") as f:
+        obj = pickle.load(f)
+    joblib_path = pkl_path.with_suffix(".joblib")
+    joblib.dump(obj, joblib_path, protocol=pickle.HIGHEST_PROTOCOL)
+    print(f"✅ {pkl_path.name} -> {joblib_path.name}")